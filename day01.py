@@ -1,29 +1,79 @@
 import itertools as it
-from typing import List
+from typing import Iterable, Iterator, List
 
-from utils import read_input
+from utils import input_path, iter_lines, optional_import, profiled, raw_lines
 
+np = optional_import("numpy")
 
-def nwise(itr, n):
-    copies = it.tee(itr, n)
-    return zip(*[it.islice(copy, i, None) for i, copy in enumerate(copies)])
+NUMPY_THRESHOLD = 4096
 
 
+def _check_window(k: int):
+    if k < 1:
+        raise ValueError(f"window size must be at least 1, got {k}")
+
+
+def count_increases(readings: Iterable[int], k: int = 1) -> int:
+    """Number of windows of k readings whose sum is larger than the window before.
+    Window i+1 is larger than window i exactly when a[i+k] > a[i], so only the
+    last k readings are kept, in a ring buffer, and no sums are formed.
+    """
+    _check_window(k)
+    readings = iter(readings)
+    ring = list(it.islice(readings, k))
+    count, idx = 0, 0
+    for reading in readings:
+        count += reading > ring[idx]
+        ring[idx] = reading
+        idx += 1
+        if idx == k:
+            idx = 0
+    return count
+
+
+def stream_readings(fname: str = input_path("01")) -> Iterator[int]:
+    """Depth readings straight from a file, one line at a time.
+    """
+    return (int(line) for line in raw_lines(fname) if line.strip())
+
+
+def count_increases_np(readings, k: int = 1) -> int:
+    """Same as count_increases, with one comparison of shifted arrays.
+    """
+    _check_window(k)
+    readings = np.asarray(readings, dtype=np.int64)
+    return int(np.count_nonzero(readings[k:] > readings[:-k]))
+
+
+def load_readings(fname: str = input_path("01")):
+    """Depth readings of a file as an int64 array, parsed by numpy without going
+    through Python ints.
+    """
+    return np.fromfile(fname, dtype=np.int64, sep=" ")
+
+
+def increases(readings, k: int) -> int:
+    if np is not None and len(readings) >= NUMPY_THRESHOLD:
+        return count_increases_np(readings, k)
+    return count_increases(readings, k)
+
+
+@profiled
 def part1(cleaned: List[int]) -> int:
-    it1, it2 = it.tee(cleaned, 2)
-    it2 = it.islice(it2, 1, None)
-    return sum(a < b for a, b in zip(it1, it2))
+    return increases(cleaned, 1)
 
 
+@profiled
 def part2(cleaned: List[int]) -> int:
-    window_sums = [sum(triple) for triple in nwise(cleaned, 3)]
-    return part1(window_sums)
+    return increases(cleaned, 3)
 
 
-def main():
-    input_ = read_input("01")
+def prepare_input():
+    return [int(line) for line in iter_lines("01")]
+
 
-    cleaned = [int(line) for line in input_.strip().split("\n")]
+def main():
+    cleaned = prepare_input()
     print(part1(cleaned))
     print(part2(cleaned))
 
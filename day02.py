@@ -1,78 +1,168 @@
+import functools
+from array import array
 from dataclasses import dataclass
-from typing import List
+from typing import Iterable, NamedTuple
 
-from utils import read_input
+from utils import input_path, optional_import, profiled, raw_lines
 
+np = optional_import("numpy")
 
-@dataclass
-class V:
-    hor: int
-    dep: int
-
-    def __add__(self, other):
-        return V(self.hor + other.hor, self.dep + other.dep)
+CHUNK_SIZE = 1 << 16
+NUMPY_THRESHOLD = 4096
 
-    def __iter__(self):
-        yield self.hor
-        yield self.dep
+FORWARD, DOWN, UP = range(3)
+CODES = {ord("f"): FORWARD, ord("d"): DOWN, ord("u"): UP}
 
 
-def direction(instruction: List[str]) -> V:
-    dir, dist_s = instruction
-    dist = int(dist_s)
-    if dir == "forward":
-        return V(dist, 0)
-    if dir == "down":
-        return V(0, dist)
+@dataclass
+class Commands:
+    """A command log as two columns: direction codes (uint8) and distances
+    (int32), five bytes per command. Its length is the number of commands, and
+    slicing it gives the log of a run of commands.
+    """
+
+    codes: array
+    dists: array
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, key: slice) -> "Commands":
+        if not isinstance(key, slice):
+            raise TypeError(f"Commands only support slicing, got {key!r}")
+        return Commands(self.codes[key], self.dists[key])
+
+    def columns(self):
+        """The columns as numpy arrays, without copying them.
+        """
+        return (
+            np.frombuffer(self.codes, dtype=np.uint8),
+            np.frombuffer(self.dists, dtype=np.int32),
+        )
+
+
+def parse_commands(lines: Iterable[bytes]) -> Commands:
+    codes, dists = array("B"), array("i")
+    for line in lines:
+        if line:
+            codes.append(CODES[line[0]])
+            dists.append(int(line[line.rindex(b" ") + 1 :]))
+    return Commands(codes, dists)
+
+
+class Course(NamedTuple):
+    """Net effect of a run of commands on a submarine that starts with aim 0:
+    it moves hor forward, dep deeper and turns its aim by aim. Starting from aim
+    a instead it ends up a * hor deeper, so courses compose like affine maps.
+    """
+
+    hor: int = 0
+    dep: int = 0
+    aim: int = 0
+
+    def then(self, other: "Course") -> "Course":
+        return Course(
+            self.hor + other.hor,
+            self.dep + other.dep + self.aim * other.hor,
+            self.aim + other.aim,
+        )
+
+
+def summarize(commands: Commands) -> Course:
+    hor = dep = aim = 0
+    for code, dist in zip(commands.codes, commands.dists):
+        if code == FORWARD:
+            hor += dist
+            dep += aim * dist
+        elif code == DOWN:
+            aim += dist
+        else:
+            aim -= dist
+    return Course(hor, dep, aim)
+
+
+def fits_int64(commands: Commands) -> bool:
+    """Whether int64 arithmetic is exact for the whole log: hor and aim never
+    exceed the total distance, and dep never exceeds its square.
+    """
+    _, dists = commands.columns()
+    total = int(dists.sum(dtype=np.int64))
+    return total * total < 2 ** 63
+
+
+def steps(commands: Commands, dtype=None):
+    """How far each command moves forward and how much it turns the aim, as two
+    arrays of dtype (int64 by default).
+    """
+    codes, dists = commands.columns()
+    dists = dists.astype(dtype or np.int64)
+    forward = np.where(codes == FORWARD, dists, 0)
+    turn = np.where(codes == DOWN, dists, 0) - np.where(codes == UP, dists, 0)
+    return forward, turn
+
+
+def summarize_np(commands: Commands) -> Course:
+    if not fits_int64(commands):
+        return summarize(commands)
+    forward, turn = steps(commands)
+    # A forward command never turns, so the running aim is the aim it moves at.
+    aim = np.cumsum(turn)
+    return Course(
+        int(forward.sum()), int(np.dot(forward, aim)), int(aim[-1]) if len(aim) else 0
+    )
+
+
+def summarize_chunked(
+    commands: Commands, chunk_size: int = CHUNK_SIZE, jobs: int = None
+) -> Course:
+    """Course of a long log, summarizing chunks of it in a process pool
+    (jobs=None means one worker per CPU) and then composing them in order.
+    """
+    chunks = [commands[i : i + chunk_size] for i in range(0, len(commands), chunk_size)]
+    if jobs == 1 or len(chunks) <= 1:
+        courses = map(summarize, chunks)
     else:
-        return V(0, -dist)
+        from concurrent.futures import ProcessPoolExecutor
 
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            courses = list(pool.map(summarize, chunks))
+    return functools.reduce(Course.then, courses, Course())
 
-def part1(cleaned: List[List[str]]) -> int:
-    h, d = sum((direction(instr) for instr in cleaned), V(0, 0))
-    return h * d
 
+def trajectory(commands: Commands):
+    """Position (hor, dep, aim) after every command, as an (n, 3) array.
+    Logs that would overflow int64 get an array of Python ints instead.
+    """
+    forward, turn = steps(commands, None if fits_int64(commands) else object)
+    aim = np.cumsum(turn)
+    return np.column_stack((np.cumsum(forward), np.cumsum(forward * aim), aim))
 
-###########
 
+def course(commands: Commands) -> Course:
+    if np is not None and len(commands) >= NUMPY_THRESHOLD:
+        return summarize_np(commands)
+    return summarize(commands)
 
-@dataclass
-class V2:
-    hor: int
-    dep: int
-    aim: int
-
-    def __add__(self, other):
-        return V(self.hor + other.hor, self.dep + other.dep, self.aim + other.aim)
-
-    def __iter__(self):
-        yield self.hor
-        yield self.dep
-        yield self.aim
-
-
-def direction2(instruction: List[str], loc: V2) -> V2:
-    dir, dist_s = instruction
-    dist = int(dist_s)
-    if dir == "forward":
-        return V2(loc.hor + dist, loc.dep + dist * loc.aim, loc.aim)
-    if dir == "down":
-        return V2(loc.hor, loc.dep, loc.aim + dist)
-    else:
-        return V2(loc.hor, loc.dep, loc.aim - dist)
 
+@profiled
+def part1(cleaned: Commands) -> int:
+    # Without aim, down and up change the depth the way they change the aim.
+    total = course(cleaned)
+    return total.hor * total.aim
 
-def part2(cleaned: List[List[str]]) -> int:
-    loc = V2(0, 0, 0)
-    for instr in cleaned:
-        loc = direction2(instr, loc)
-    return loc.hor * loc.dep
 
+@profiled
+def part2(cleaned: Commands) -> int:
+    total = course(cleaned)
+    return total.hor * total.dep
 
-def main():
-    input_ = read_input("02")
 
-    cleaned = [line.split() for line in input_.strip().split("\n")]
+def prepare_input():
+    return parse_commands(raw_lines(input_path("02")))
+
+
+def main():
+    cleaned = prepare_input()
     print(part1(cleaned))
     print(part2(cleaned))
 
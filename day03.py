@@ -1,55 +1,136 @@
-import collections
-from typing import List
+import bisect
+import itertools as it
+from typing import Iterable, List, NamedTuple
 
-from utils import read_input
+from utils import input_path, iter_lines, optional_import, profiled
 
+np = optional_import("numpy")
 
-def flip(c: str) -> str:
-    return "1" if c == "0" else "0"
+NUMPY_THRESHOLD = 4096
 
 
-def match_digit(digits: List[str], more_common: bool) -> str:
-    zeroes, ones = digits.count("0"), digits.count("1")
-    if zeroes == ones:
-        return str(int(more_common))
-    if more_common:
-        return "0" if zeroes > ones else "1"
-    else:
-        return "1" if zeroes > ones else "0"
+class Report(NamedTuple):
+    """Diagnostic words as sorted integers of a fixed number of bits.
+    The words starting with any given bits form a contiguous range of the sorted
+    list, so a range and a bisection play the part of a binary trie node and its
+    subtree counts.
+    """
 
+    words: List[int]
+    bits: int
 
-def filter_down(seqs: List[str], more_common: bool) -> str:
-    candidates = seqs[:]
-    for idx in range(len(seqs[0])):
-        digits = [seq[idx] for seq in candidates]
-        candidates = [
-            seq for seq in candidates if seq[idx] == match_digit(digits, more_common)
-        ]
+
+def parse_report(lines: Iterable[str]) -> Report:
+    lines = list(lines)
+    return Report(sorted(int(line, 2) for line in lines), len(lines[0]))
+
+
+def column_ones(report: Report) -> List[int]:
+    """Number of words with each bit set, least significant bit first.
+    A word read back in base 32 has each of its bits in a 5-bit field, so adding
+    up 31 of them counts the ones of every column at once.
+    """
+    spread = map(int, map("{:b}".format, report.words), it.repeat(32))
+    ones = [0] * report.bits
+    for _ in range(0, len(report.words), 31):
+        total = sum(it.islice(spread, 31))
+        for b in range(report.bits):
+            ones[b] += total >> 5 * b & 31
+    return ones
+
+
+def rating(report: Report, more_common: bool) -> int:
+    words = report.words
+    lo, hi, prefix = 0, len(words), 0
+    for b in reversed(range(report.bits)):
+        split = bisect.bisect_left(words, prefix | 1 << b, lo, hi)
+        zeroes, ones = split - lo, hi - split
+        if (ones >= zeroes) == more_common:
+            lo, prefix = split, prefix | 1 << b
+        else:
+            hi = split
+        if hi - lo == 1:
+            return words[lo]
+
+    raise ValueError
+
+
+def bit_matrix(report: Report):
+    """The report as an (n, bits) uint8 array of 0s and 1s, most significant
+    bit first like the input. Words of any width are unpacked from their bytes.
+    """
+    width = (report.bits + 7) // 8
+    raw = b"".join(word.to_bytes(width, "big") for word in report.words)
+    packed = np.frombuffer(raw, dtype=np.uint8).reshape(-1, width)
+    return np.unpackbits(packed, axis=1)[:, 8 * width - report.bits :]
+
+
+def load_bit_matrix(fname: str = input_path("03")):
+    """Bit matrix straight from the bytes of a report file.
+    """
+    raw = np.fromfile(fname, dtype=np.uint8)
+    raw = raw[raw != ord("\r")]  # Windows line endings
+    # Blank lines at either end are dropped, like iter_lines does.
+    filled = np.flatnonzero(raw != ord("\n"))
+    raw = np.append(raw[filled[0] : filled[-1] + 1], np.uint8(ord("\n")))
+    width = int(np.argmax(raw == ord("\n"))) + 1
+    return raw.reshape(-1, width)[:, :-1] - np.uint8(ord("0"))
+
+
+def to_int(bits) -> int:
+    return int("".join(map(str, bits.tolist())), 2)
+
+
+def gamma_epsilon_np(matrix) -> tuple[int, int]:
+    ones = np.count_nonzero(matrix, axis=0)
+    most_common = (2 * ones > len(matrix)).astype(np.uint8)
+    return to_int(most_common), to_int(1 - most_common)
+
+
+def filter_down_np(matrix, more_common: bool) -> int:
+    """filter_down on a bit matrix, keeping the candidates with a boolean mask.
+    """
+    candidates = matrix
+    for idx in range(matrix.shape[1]):
+        column = candidates[:, idx]
+        ones = np.count_nonzero(column)
+        keep = (2 * ones >= len(column)) == more_common
+        candidates = candidates[column == keep]
         if len(candidates) == 1:
-            return candidates[0]
+            return to_int(candidates[0])
 
     raise ValueError
 
 
-def part1(cleaned: List[str]) -> int:
-    most_common = "".join(
-        "1" if digits.count("1") > digits.count("0") else "0"
-        for digits in zip(*cleaned)
+def filter_down(seqs: List[str], more_common: bool) -> str:
+    report = parse_report(seqs)
+    return format(rating(report, more_common), f"0{report.bits}b")
+
+
+@profiled
+def part1(cleaned: Report) -> int:
+    if np is not None and len(cleaned.words) >= NUMPY_THRESHOLD:
+        gamma, epsilon = gamma_epsilon_np(bit_matrix(cleaned))
+        return gamma * epsilon
+    n = len(cleaned.words)
+    gamma = sum(
+        1 << b for b, ones in enumerate(column_ones(cleaned)) if ones > n - ones
     )
-    least_common = "".join(flip(c) for c in most_common)
-    return int(most_common, 2) * int(least_common, 2)
+    epsilon = gamma ^ (1 << cleaned.bits) - 1
+    return gamma * epsilon
 
 
-def part2(cleaned: List[str]) -> int:
-    big = filter_down(cleaned, True)
-    small = filter_down(cleaned, False)
-    return int(big, 2) * int(small, 2)
+@profiled
+def part2(cleaned: Report) -> int:
+    return rating(cleaned, True) * rating(cleaned, False)
 
 
-def main():
-    input_ = read_input("03")
-    cleaned = input_.strip().split("\n")
+def prepare_input():
+    return parse_report(iter_lines("03"))
 
+
+def main():
+    cleaned = prepare_input()
     print(part1(cleaned))
     print(part2(cleaned))
 
@@ -2,7 +2,11 @@ from collections import Counter
 from dataclasses import dataclass
 from typing import Set, Tuple
 
-from utils import read_input
+from utils import iter_blocks, optional_import, profiled
+
+np = optional_import("numpy")
+
+NUMPY_THRESHOLD = 256
 
 board_row = list[int]
 bingo_board = list[board_row]
@@ -33,66 +37,167 @@ class BingoBoard:
         return cls(int_rows)
 
 
+class BoardStack:
+    """Boards of one size stacked into a (K, n, m) array, with the index of the
+    draw marking each cell and a boolean tensor of the cells marked so far.
+    """
+
+    def __init__(self, boards: list[BingoBoard], draws: list[int]):
+        self.cards = np.array([board.card for board in boards], dtype=np.int64)
+        self.turns = self.cell_turns(draws)
+        self.marked = np.zeros(self.cards.shape, dtype=bool)
+
+    def cell_turns(self, draws: list[int]):
+        """Index of the draw marking each cell, len(draws) for cells never drawn.
+        """
+        never = len(draws)
+        if not draws:
+            return np.full(self.cards.shape, never, dtype=np.int64)
+        # The distinct numbers, sorted, with the index of their first draw.
+        numbers, first = np.unique(np.array(draws, dtype=np.int64), return_index=True)
+        pos = np.minimum(np.searchsorted(numbers, self.cards), len(numbers) - 1)
+        return np.where(numbers[pos] == self.cards, first[pos], never)
+
+    def mark_through(self, turns):
+        """Mark the cells drawn up to and including turn, a single draw index or
+        one for every board.
+        """
+        self.marked = self.turns <= np.reshape(turns, (-1, 1, 1))
+
+    def unmarked_sums(self):
+        return np.where(self.marked, 0, self.cards).sum(axis=(1, 2))
+
+    def win_turns(self):
+        """Draw index on which every board wins, len(draws) for boards that never
+        do, without replaying the draws.
+        """
+        turns = self.turns
+        return np.minimum(turns.max(axis=2).min(axis=1), turns.max(axis=1).min(axis=1))
+
+
+def stacks_by_shape(
+    boards: list[BingoBoard], draws: list[int]
+) -> list[Tuple[list[int], BoardStack]]:
+    """(board indices, stack) for every board size, since only boards of one size
+    stack into an array.
+    """
+    by_shape: dict[Tuple[int, ...], list[int]] = {}
+    for idx, board in enumerate(boards):
+        by_shape.setdefault(tuple(map(len, board.card)), []).append(idx)
+    return [
+        (indices, BoardStack([boards[idx] for idx in indices], draws))
+        for indices in by_shape.values()
+    ]
+
+
+def draw_turns(draws: list[int]) -> dict[int, int]:
+    """Index of the draw that marks each number.
+    """
+    turns: dict[int, int] = {}
+    for turn, num in enumerate(draws):
+        turns.setdefault(num, turn)
+    return turns
+
+
+def win_turn(board: BingoBoard, turns: dict[int, int], never: int) -> int:
+    """Index of the draw on which the board wins, or never if it does not.
+    A line is complete once its last number is drawn, and the board wins with
+    its first complete line.
+    """
+    marked = [[turns.get(num, never) for num in row] for row in board.card]
+    return min(min(map(max, marked)), min(map(max, zip(*marked))))
+
+
+def win_scores(
+    draws: list[int], boards: list[BingoBoard]
+) -> list[Tuple[int, int, int]]:
+    """(win turn, board index, sum of its unmarked numbers then) of every board
+    that wins, in order of winning. Boards winning on the same draw keep their
+    order.
+    """
+    never = len(draws)
+    out = []
+    if np is not None and len(boards) >= NUMPY_THRESHOLD:
+        for indices, stack in stacks_by_shape(boards, draws):
+            turns = stack.win_turns()
+            stack.mark_through(turns)
+            sums = stack.unmarked_sums()
+            out += [
+                (int(turn), idx, int(total))
+                for idx, turn, total in zip(indices, turns, sums)
+                if turn != never
+            ]
+        return sorted(out)
+    turns = draw_turns(draws)
+    for idx, board in enumerate(boards):
+        turn = win_turn(board, turns, never)
+        if turn != never:
+            total = sum(
+                n for row in board.card for n in row if turns.get(n, never) > turn
+            )
+            out.append((turn, idx, total))
+    return sorted(out)
+
+
+def win_order(draws: list[int], boards: list[BingoBoard]) -> list[Tuple[int, int]]:
+    """(win turn, board index) of every board that wins, in order of winning.
+    """
+    return [(turn, idx) for turn, idx, _ in win_scores(draws, boards)]
+
+
 def get_first_winner(
     draws: list[int], boards: list[BingoBoard]
 ) -> Tuple[int, BingoBoard]:
-    drawn_set = set()
-    for num in draws:
-        drawn_set.add(num)
-        if winners := [board for board in boards if board.is_winning(drawn_set)]:
-            return num, winners[0]
-    raise ValueError
+    order = win_order(draws, boards)
+    if not order:
+        raise ValueError
+    turn, idx = order[0]
+    return draws[turn], boards[idx]
 
 
 def get_winners_by_stage(
     draws: list[int], boards: list[BingoBoard]
 ) -> dict[int, list[BingoBoard]]:
-
+    """For every draw that completes a board, all the boards that have won by
+    then.
+    """
     winners_by_stage: dict[int, list[BingoBoard]] = {}
-    drawn_set = set()
-
-    for stage, num in enumerate(draws):
-        drawn_set.add(num)
-        winners = [board for board in boards if board.is_winning(drawn_set)]
-        if len(winners) > len(
-            winners_by_stage.get(max(winners_by_stage, default=0), [])
-        ):
-            winners_by_stage[stage] = winners
-
+    winners: list[BingoBoard] = []
+    for turn, idx in win_order(draws, boards):
+        winners.append(boards[idx])
+        winners_by_stage[turn] = winners[:]
     return winners_by_stage
 
 
+@profiled
 def part1(draws: list[int], boards: list[BingoBoard]):
-    stage, winner = get_first_winner(draws, boards)
-    drawn_set = set(draws[: stage + 1])
-    unmarked_sum = sum(sum(n for n in row if n not in drawn_set) for row in winner.rows)
-    return stage * unmarked_sum
+    scores = win_scores(draws, boards)
+    if not scores:
+        raise ValueError
+    turn, _, total = scores[0]
+    return draws[turn] * total
 
 
+@profiled
 def part2(draws: list[int], boards: list[BingoBoard]):
-    winners_by_stage = get_winners_by_stage(draws, boards)
-    penultimate_stage, last_stage = sorted(winners_by_stage)[-2:]
-
-    last_board = [
-        board
-        for board in winners_by_stage[last_stage]
-        if board not in winners_by_stage[penultimate_stage]
-    ][0]
-
-    drawn_set = set(draws[: last_stage + 1])
-    unmarked_sum = sum(
-        sum(n for n in row if n not in drawn_set) for row in last_board.rows
-    )
-    return unmarked_sum * draws[last_stage]
+    scores = win_scores(draws, boards)
+    if not scores:
+        raise ValueError
+    last_turn = scores[-1][0]
+    # Of the boards completed by the same last draw, the first one counts.
+    total = next(total for turn, _, total in scores if turn == last_turn)
+    return draws[last_turn] * total
 
 
-def main():
-    input_ = read_input("04")
-    cleaned = input_.strip().split("\n\n")
-    raw_draws, *raw_boards = cleaned
+def prepare_input() -> Tuple[list[int], list[BingoBoard]]:
+    raw_draws, *raw_boards = iter_blocks("04")
     draws: list[int] = [int(n) for n in raw_draws.split(",")]
     boards: list[BingoBoard] = [BingoBoard.from_str(board) for board in raw_boards]
+    return draws, boards
+
 
+def main():
+    draws, boards = prepare_input()
     print(part1(draws, boards))
     print(part2(draws, boards))
 
@@ -1,10 +1,17 @@
+import bisect
+import itertools as it
 import re
-from collections import Counter
+from collections import Counter, defaultdict
 from dataclasses import dataclass
 from fractions import Fraction
-from typing import NamedTuple
+from typing import Callable, Iterator, NamedTuple
 
-from utils import read_input
+from utils import cached_parse, iter_lines, optional_import, profiled
+
+np = optional_import("numpy")
+
+# Largest bounding box, in cells, rasterized into a dense array (4 bytes a cell).
+DENSE_MAX_CELLS = 1 << 25
 
 
 class Point(NamedTuple):
@@ -57,19 +64,252 @@ def lattice_segment_counts(segments: list[Segment], exclude_diagonal=True):
     return counts
 
 
+def bounding_box(segments: list[Segment]) -> tuple[Point, Point]:
+    xs = [p.x for s in segments for p in (s.p1, s.p2)]
+    ys = [p.y for s in segments for p in (s.p1, s.p2)]
+    return P(min(xs), min(ys)), P(max(xs), max(ys))
+
+
+def dense_segment_counts(segments: list[Segment], exclude_diagonal=True):
+    """How many segments cover each cell of the bounding box of all segments,
+    as a 2D array indexed by (y - min y, x - min x).
+    Every segment is one strided slice of the flattened array: step 1 along a row,
+    the row width down a column, and one more or less than that on a diagonal.
+    """
+    if exclude_diagonal:
+        segments = [s for s in segments if s.is_hori or s.is_vert]
+    if not segments:
+        return np.zeros((0, 0), dtype=np.int32)
+    (x0, y0), (x_max, y_max) = bounding_box(segments)
+    width = x_max - x0 + 1
+    counts = np.zeros((y_max - y0 + 1, width), dtype=np.int32)
+    flat = counts.reshape(-1)
+    for seg in segments:
+        (x1, y1), (x2, y2) = seg.p1, seg.p2
+        start = (y1 - y0) * width + x1 - x0
+        end = (y2 - y0) * width + x2 - x0
+        dx, dy = (x2 > x1) - (x2 < x1), (y2 > y1) - (y2 < y1)
+        step = dy * width + dx or 1
+        if step > 0:
+            flat[start : end + 1 : step] += 1
+        else:
+            flat[end : start + 1 : -step] += 1
+    return counts
+
+
+class Family(NamedTuple):
+    """Parallel lines of one direction. Each line has a key, shared by all of its
+    points, and each point a parameter t along its line.
+    """
+
+    key: Callable[[int, int], int]
+    param: Callable[[int, int], int]
+    point: Callable[[int, int], Point]
+
+
+HORI = Family(lambda x, y: y, lambda x, y: x, lambda k, t: P(t, k))
+VERT = Family(lambda x, y: x, lambda x, y: y, lambda k, t: P(k, t))
+RISING = Family(lambda x, y: y - x, lambda x, y: x, lambda k, t: P(t, t + k))
+FALLING = Family(lambda x, y: x + y, lambda x, y: x, lambda k, t: P(t, k - t))
+
+
+def family_of(seg: Segment) -> Family:
+    if seg.is_hori:
+        return HORI
+    if seg.is_vert:
+        return VERT
+    return RISING if (seg.p2.x - seg.p1.x) == (seg.p2.y - seg.p1.y) else FALLING
+
+
+def _extend(intervals: list[list[int]], lo: int, hi: int):
+    if intervals and intervals[-1][1] == lo - 1:
+        intervals[-1][1] = hi
+    else:
+        intervals.append([lo, hi])
+
+
+def merge_intervals(intervals: list[tuple[int, int]]):
+    """Parameter ranges of one line covered by at least one and at least two of
+    the given closed intervals, each as a sorted list of disjoint [lo, hi].
+    """
+    events = sorted(
+        [(lo, 1) for lo, _ in intervals] + [(hi + 1, -1) for _, hi in intervals]
+    )
+    covered: list[list[int]] = []
+    doubled: list[list[int]] = []
+    depth, prev = 0, None
+    for pos, delta in events:
+        if prev is not None and pos > prev:
+            if depth >= 1:
+                _extend(covered, prev, pos - 1)
+            if depth >= 2:
+                _extend(doubled, prev, pos - 1)
+        depth += delta
+        prev = pos
+    return covered, doubled
+
+
+def _contains(intervals: list[list[int]], t: int) -> bool:
+    idx = bisect.bisect_right(intervals, [t, float("inf")]) - 1
+    return idx >= 0 and intervals[idx][1] >= t
+
+
+class ActiveKeys:
+    """Set of keys out of a fixed sorted list, in a Fenwick tree of counts, so
+    that adding or removing a key takes O(log n) and so does listing each of the
+    keys present in a range.
+    """
+
+    def __init__(self, keys: list[int]):
+        self.keys = keys
+        self.tree = [0] * (len(keys) + 1)
+
+    def add(self, key: int, delta: int = 1):
+        idx = bisect.bisect_left(self.keys, key) + 1
+        while idx < len(self.tree):
+            self.tree[idx] += delta
+            idx += idx & -idx
+
+    def _count_below(self, idx: int) -> int:
+        total = 0
+        while idx:
+            total += self.tree[idx]
+            idx -= idx & -idx
+        return total
+
+    def _kth(self, k: int) -> int:
+        """Position in keys of the k-th present key, counting from 1."""
+        pos, step = 0, 1 << len(self.tree).bit_length()
+        while step:
+            if pos + step < len(self.tree) and self.tree[pos + step] < k:
+                pos += step
+                k -= self.tree[pos]
+            step >>= 1
+        return pos
+
+    def between(self, lo: int, hi: int) -> Iterator[int]:
+        """The keys present in [lo, hi], in order."""
+        first = self._count_below(bisect.bisect_left(self.keys, lo))
+        last = self._count_below(bisect.bisect_right(self.keys, hi))
+        for k in range(first + 1, last + 1):
+            yield self.keys[self._kth(k)]
+
+
+def crossings_between(
+    fam_a: Family, lines_a: dict[int, list], fam_b: Family, lines_b: dict[int, list]
+) -> Iterator[Point]:
+    """Lattice points where a range of a line of fam_a crosses one of fam_b.
+
+    In coordinates (key along fam_a, key along fam_b), the ranges of fam_a are
+    segments parallel to the second axis and those of fam_b parallel to the first.
+    The ranges of fam_b are swept along the first axis, keeping the keys of those
+    that cross the sweep line, and each range of fam_a lists the keys in its span.
+    Lines of fam_b only cross a line of fam_a on lattice points for some residues
+    of their keys (along a rising line, falling keys step by 2), so lines are
+    first split by residue and only matching classes are swept together.
+    """
+    # Along line key_a, the key of the crossing line of fam_b is c0 + c1 t.
+    c1 = fam_b.key(*fam_a.point(0, 1)) - fam_b.key(*fam_a.point(0, 0))
+    step = abs(c1)
+
+    def c0(key_a):
+        return fam_b.key(*fam_a.point(key_a, 0))
+
+    # Events (position on the first axis, kind, lo, hi): a range of fam_b starts
+    # (0) or ends (2) covering key lo == hi, or a range of fam_a spans [lo, hi] (1).
+    # Starts sort before and ends after the spans at the same position.
+    events = defaultdict(list)
+    for key_a, ranges in lines_a.items():
+        for lo, hi in ranges:
+            v1, v2 = sorted([c0(key_a) + c1 * lo, c0(key_a) + c1 * hi])
+            events[c0(key_a) % step].append((key_a, 1, v1, v2))
+    keys = defaultdict(list)
+    for key_b, ranges in lines_b.items():
+        keys[key_b % step].append(key_b)
+        for lo, hi in ranges:
+            u1, u2 = sorted(fam_a.key(*fam_b.point(key_b, t)) for t in (lo, hi))
+            events[key_b % step] += [(u1, 0, key_b, key_b), (u2, 2, key_b, key_b)]
+
+    for residue, residue_events in events.items():
+        active = ActiveKeys(sorted(keys[residue]))
+        for pos, kind, lo, hi in sorted(residue_events):
+            if kind == 0:
+                active.add(lo)
+            elif kind == 2:
+                active.add(lo, -1)
+            else:
+                for key_b in active.between(lo, hi):
+                    yield fam_a.point(pos, (key_b - c0(pos)) // c1)
+
+
+def sweep_overlap_count(segments: list[Segment], exclude_diagonal=True) -> int:
+    """Number of lattice points covered by at least two segments, without
+    visiting the lattice points of the segments.
+
+    Segments on a common line are merged into the ranges they cover once and
+    twice. A point covered twice is then either in a twice-covered range, or
+    where two lines of different directions cross, found for every pair of
+    directions by crossings_between in O((n + crossings) log n).
+    """
+    lines: dict[Family, dict[int, list]] = defaultdict(lambda: defaultdict(list))
+    for seg in segments:
+        if exclude_diagonal and not (seg.is_hori or seg.is_vert):
+            continue
+        fam = family_of(seg)
+        t1, t2 = sorted([fam.param(*seg.p1), fam.param(*seg.p2)])
+        lines[fam][fam.key(*seg.p1)].append((t1, t2))
+
+    covered: dict[Family, dict[int, list]] = defaultdict(dict)
+    doubled: dict[Family, dict[int, list]] = defaultdict(dict)
+    for fam, keyed in lines.items():
+        for key, intervals in keyed.items():
+            covered[fam][key], doubled[fam][key] = merge_intervals(intervals)
+
+    crossings = set()
+    for fam_a, fam_b in it.combinations(list(covered), 2):
+        crossings.update(
+            crossings_between(fam_a, covered[fam_a], fam_b, covered[fam_b])
+        )
+
+    total = sum(
+        hi - lo + 1
+        for keyed in doubled.values()
+        for ranges in keyed.values()
+        for lo, hi in ranges
+    )
+    # A crossing point was counted once for every line it is doubled on.
+    for pt in crossings:
+        total += 1 - sum(
+            _contains(keyed.get(fam.key(*pt), []), fam.param(*pt))
+            for fam, keyed in doubled.items()
+        )
+    return total
+
+
+def overlap_count(segments: list[Segment], exclude_diagonal=True) -> int:
+    """Number of lattice points covered by at least two segments.
+    """
+    if not segments:
+        return 0
+    (x0, y0), (x1, y1) = bounding_box(segments)
+    if np is not None and (x1 - x0 + 1) * (y1 - y0 + 1) <= DENSE_MAX_CELLS:
+        counts = dense_segment_counts(segments, exclude_diagonal)
+        return int(np.count_nonzero(counts >= 2))
+    return sweep_overlap_count(segments, exclude_diagonal)
+
+
+@profiled
 def part1(segments: list[Segment]):
-    counts = lattice_segment_counts(segments)
-    return sum(1 for pt, count in counts.items() if count >= 2)
+    return overlap_count(segments)
 
 
+@profiled
 def part2(segments: list[Segment]):
-    counts = lattice_segment_counts(segments, exclude_diagonal=False)
-    return sum(1 for pt, count in counts.items() if count >= 2)
+    return overlap_count(segments, exclude_diagonal=False)
 
 
+@cached_parse("05")
 def prepare_input():
-    input_ = read_input("05")
-
     pattern = re.compile(
         r"""
     (\d+),(\d+)
@@ -79,10 +319,7 @@ def prepare_input():
         re.VERBOSE,
     )
 
-    nums = [
-        map(int, re.match(pattern, line).groups())
-        for line in input_.strip().split("\n")
-    ]
+    nums = [map(int, re.match(pattern, line).groups()) for line in iter_lines("05")]
     pairs_of_points = [(P(a, b), P(c, d)) for a, b, c, d in nums]
     segments = [Segment(*sorted(pair)) for pair in pairs_of_points]
     return segments
@@ -1,6 +1,12 @@
+import functools
 from collections import Counter
+from typing import Iterable, Optional
 
-from utils import read_input
+from utils import profiled, read_input
+
+# A fish's timer runs from 8 down to 0, then resets to 6 and spawns a new fish.
+STATES = 9
+Matrix = list[list[int]]
 
 
 def update_timer_counts(counts):
@@ -13,6 +19,79 @@ def update_timer_counts(counts):
     return new_counts
 
 
+def transition() -> Matrix:
+    """Matrix taking the counts of fish by timer on one day to those on the next.
+    """
+    matrix = [[0] * STATES for _ in range(STATES)]
+    for time in range(1, STATES):
+        matrix[time - 1][time] = 1
+    matrix[6][0] = matrix[8][0] = 1
+    return matrix
+
+
+def mat_mul(a: Matrix, b: Matrix, mod: Optional[int] = None) -> Matrix:
+    cols = list(zip(*b))
+    out = [[sum(x * y for x, y in zip(row, col)) for col in cols] for row in a]
+    if mod is not None:
+        out = [[x % mod for x in row] for row in out]
+    return out
+
+
+def timer_counts(timers: Iterable[int]) -> list[int]:
+    counts = Counter(timers)
+    return [counts[time] for time in range(STATES)]
+
+
+@functools.lru_cache(maxsize=None)
+def doubling_power(k: int, mod: Optional[int] = None) -> Matrix:
+    """The transition matrix to the power 2 ** k, shared by all queries.
+    """
+    if k == 0:
+        return transition()
+    half = doubling_power(k - 1, mod)
+    return mat_mul(half, half, mod)
+
+
+def descendants(days: int, mod: Optional[int] = None) -> list[int]:
+    """Number of fish after the given number of days, for a single fish starting
+    at each timer value.
+    """
+    if days < 0:
+        raise ValueError(f"number of days must not be negative, got {days}")
+    # The row of ones times the transition matrix to the power days.
+    weights = [1] * STATES
+    for k in range(days.bit_length()):
+        if days >> k & 1:
+            power = doubling_power(k, mod)
+            weights = [
+                sum(w * row[j] for w, row in zip(weights, power)) for j in range(STATES)
+            ]
+            if mod is not None:
+                weights = [w % mod for w in weights]
+    return weights
+
+
+def population(timers: Iterable[int], days: int, mod: Optional[int] = None) -> int:
+    """Number of fish after the given number of days, modulo mod if given.
+    """
+    return populations([timers], [days], mod)[0][0]
+
+
+def populations(
+    schools: Iterable[Iterable[int]], horizons: Iterable[int], mod: Optional[int] = None
+) -> list[list[int]]:
+    """Population of every school of fish (given by their timers) after every
+    number of days, as a matrix with a row per school and a column per horizon.
+    """
+    weights = [descendants(days, mod) for days in horizons]
+    out = []
+    for timers in schools:
+        counts = timer_counts(timers)
+        row = [sum(c * w for c, w in zip(counts, ws)) for ws in weights]
+        out.append(row if mod is None else [n % mod for n in row])
+    return out
+
+
 def prepare_input():
     input_ = read_input("06")
     timers_str = input_.strip().split(",")
@@ -20,18 +99,14 @@ def prepare_input():
     return list(timers)
 
 
+@profiled
 def part1(timers):
-    counts = Counter(timers)
-    for _ in range(80):
-        counts = update_timer_counts(counts)
-    return sum(counts.values())
+    return population(timers, 80)
 
 
+@profiled
 def part2(timers):
-    counts = Counter(timers)
-    for _ in range(256):
-        counts = update_timer_counts(counts)
-    return sum(counts.values())
+    return population(timers, 256)
 
 
 def main():
@@ -1,34 +1,119 @@
-from math import ceil, floor
-
-from utils import read_input
-
-
-def median(nums):
-    N = len(nums)
-    nums_sorted = sorted(nums)
-    return nums_sorted[N // 2] if N % 2 == 1 else nums_sorted[N // 2 - 1]
-
-
-def mean(nums):
-    return sum(nums) / len(nums)
-
-
-def triag(n):
-    return n * (n + 1) // 2
-
-
+import bisect
+import itertools as it
+from collections import Counter
+from typing import Callable
+
+from utils import optional_import, profiled, read_input
+
+np = optional_import("numpy")
+
+MODELS = ("linear", "triangular")
+
+
+class Crabs:
+    """Crab positions as a histogram over [lo, hi], with prefix counts and prefix
+    sums so that the linear and triangular costs of any alignment are O(1).
+    """
+
+    def __init__(self, nums: list[int]):
+        hist = Counter(nums)
+        self.lo, self.hi = min(hist), max(hist)
+        self.counts = [hist[x] for x in range(self.lo, self.hi + 1)]
+        self.n = len(nums)
+        self.total = sum(x * c for x, c in hist.items())
+        self.total_sq = sum(x * x * c for x, c in hist.items())
+        # count_below[i] and sum_below[i] are over the crabs left of lo + i.
+        self.count_below = list(it.accumulate(self.counts, initial=0))
+        self.sum_below = list(
+            it.accumulate(
+                (x * c for x, c in enumerate(self.counts, self.lo)), initial=0
+            )
+        )
+
+    def median(self) -> int:
+        """The lower median, found by walking the cumulative counts.
+        """
+        idx = bisect.bisect_right(self.count_below, (self.n - 1) // 2) - 1
+        return self.lo + idx
+
+    def linear_cost(self, pos: int) -> int:
+        idx = min(max(pos - self.lo, 0), len(self.counts))
+        below, below_sum = self.count_below[idx], self.sum_below[idx]
+        above, above_sum = self.n - below, self.total - below_sum
+        return pos * below - below_sum + above_sum - pos * above
+
+    def square_cost(self, pos: int) -> int:
+        return self.total_sq - 2 * pos * self.total + self.n * pos * pos
+
+    def triangular_cost(self, pos: int) -> int:
+        # The triangular cost of d is d (d + 1) / 2 = (d ** 2 + d) / 2.
+        return (self.square_cost(pos) + self.linear_cost(pos)) // 2
+
+    def cost(self, pos: int, fuel: Callable[[int], int]) -> int:
+        """Cost of aligning at pos under any fuel model, in O(hi - lo).
+        """
+        return sum(
+            count * fuel(abs(x - pos))
+            for x, count in enumerate(self.counts, self.lo)
+            if count
+        )
+
+    def fits_int64(self, model: str) -> bool:
+        """Whether int64 arithmetic is exact for the cost curve of a model: with
+        every position at most b away from 0, no term of linear_cost exceeds
+        2 n b and no term of square_cost 2 n b ** 2, so no partial sum exceeds
+        4 n b or 4 n b ** 2 + 4 n b.
+        """
+        b = max(abs(self.lo), abs(self.hi))
+        bound = 4 * self.n * b if model == "linear" else 4 * self.n * (b * b + b)
+        return bound < 2 ** 63
+
+    def cost_curve(self, model: str = "linear"):
+        """Cost of aligning at every position lo..hi under a fuel model from
+        MODELS, from cumulative sums over the histogram. A numpy array when
+        numpy is installed, of Python ints when int64 could overflow, and a list
+        otherwise.
+        """
+        if model not in MODELS:
+            raise ValueError(f"unknown fuel model {model!r}, expected one of {MODELS}")
+        if np is None:
+            cost_at = getattr(self, f"{model}_cost")
+            return [cost_at(pos) for pos in range(self.lo, self.hi + 1)]
+
+        dtype = np.int64 if self.fits_int64(model) else object
+        pos = np.arange(self.lo, self.hi + 1, dtype=dtype)
+        below = np.array(self.count_below[:-1], dtype=dtype)
+        below_sum = np.array(self.sum_below[:-1], dtype=dtype)
+        linear = pos * (2 * below - self.n) - 2 * below_sum + self.total
+        if model == "linear":
+            return linear
+        square = self.total_sq - 2 * pos * self.total + self.n * pos * pos
+        return (square + linear) // 2
+
+    def cheapest(self, cost_at: Callable[[int], int]) -> int:
+        """Least cost over the alignments in [lo, hi], for a convex cost_at.
+        Bisects on the sign of cost_at(pos + 1) - cost_at(pos).
+        """
+        lo, hi = self.lo, self.hi
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if cost_at(mid + 1) < cost_at(mid):
+                lo = mid + 1
+            else:
+                hi = mid
+        return cost_at(lo)
+
+
+@profiled
 def part1(nums):
-    med = median(nums)
-    return sum(abs(x - med) for x in nums)
+    crabs = Crabs(nums)
+    return crabs.linear_cost(crabs.median())
 
 
+@profiled
 def part2(nums):
-    avg = mean(nums)
-    avg1 = floor(avg)
-    avg2 = ceil(avg)
-    return min(
-        sum(triag(abs(x - avg1)) for x in nums), sum(triag(abs(x - avg2)) for x in nums)
-    )
+    crabs = Crabs(nums)
+    return crabs.cheapest(crabs.triangular_cost)
 
 
 def prepare_input():
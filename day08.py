@@ -1,12 +1,25 @@
-from utils import read_input
+import collections
+import functools
+import itertools as it
+import os
+from array import array
+from typing import Iterable, Iterator
 
+from utils import iter_lines, profiled
 
-def distinguishable(display):
-    return len(set(display)) in (2, 3, 4, 7)
+# Ten patterns and four output words per note.
+NOTE_WORDS = 14
+CHUNK_SIZE = 10_000
 
 
-def part1(notes):
-    return sum(sum(1 for word in note[1] if distinguishable(word)) for note in notes)
+@profiled
+def part1(notes: array):
+    # 1, 7, 4 and 8 are the only digits lit with 2, 3, 4 and 7 segments.
+    return sum(
+        popcount(m) in (2, 3, 4, 7)
+        for i in range(0, len(notes), NOTE_WORDS)
+        for m in notes[i + 10 : i + NOTE_WORDS]
+    )
 
 
 #############
@@ -25,49 +38,108 @@ letters_contained = {
     9: set("abcdfg"),
 }
 
+WIRES = "abcdefg"
+WIRE_BITS = {c: 1 << i for i, c in enumerate(WIRES)}
 
-def num_from_letters(letters):
-    out = [num for num, s in letters_contained.items() if s == letters]
-    return out[0]
 
+@functools.lru_cache(maxsize=None)
+def mask(word: str) -> int:
+    """The wires of a word as a 7-bit mask, bit 0 for a. Cached, as there are
+    only a few thousand ways to write a word.
+    """
+    return sum(map(WIRE_BITS.__getitem__, word))
 
-letter_fingerprints = {
-    c: sorted([len(s) for s in letters_contained.values() if c in s])
-    for c in set("abcdefg")
+
+DIGIT_MASKS = {
+    mask("".join(sorted(letters))): num for num, letters in letters_contained.items()
 }
 
 
-def decoding(note):
-    encoded_fingerprints = {
-        c: sorted([len(word) for word in note[0] if c in word]) for c in set("abcdefg")
-    }
-    decoding = {
-        encoding: letter
-        for encoding, coded_print in encoded_fingerprints.items()
-        for letter, fingerprint in letter_fingerprints.items()
-        if coded_print == fingerprint
-    }
-    return decoding
+@functools.lru_cache(maxsize=None)
+def wiring_table() -> dict[tuple[int, ...], dict[int, int]]:
+    """For each of the 5040 ways to cross the wires, the sorted masks of the ten
+    patterns it shows and the digit behind each of those masks.
+    """
+    table = {}
+    for perm in it.permutations(range(len(WIRES))):
+        digits = {
+            sum(1 << perm[i] for i in range(len(WIRES)) if m >> i & 1): num
+            for m, num in DIGIT_MASKS.items()
+        }
+        table[tuple(sorted(digits))] = digits
+    return table
+
+
+def decode_masks(patterns: list[int], outputs: list[int]) -> int:
+    digits = wiring_table()[tuple(sorted(patterns))]
+    value = 0
+    for m in outputs:
+        value = 10 * value + digits[m]
+    return value
+
+
+def popcount(m: int) -> int:
+    return bin(m).count("1")
+
+
+def parse_masks(lines: Iterable[str]) -> array:
+    """Notes as one flat array of masks, NOTE_WORDS bytes per note.
+    """
+    masks = array("B")
+    for line in lines:
+        masks.extend(map(mask, line.replace("|", " ").split()))
+    return masks
 
 
-def decode(note):
-    decoder = decoding(note)
-    nums = [num_from_letters(set([decoder[c] for c in word])) for word in note[1]]
-    return int("".join(map(str, nums)))
+def decode_all(notes: array) -> list[int]:
+    return [
+        decode_masks(notes[i : i + 10], notes[i + 10 : i + NOTE_WORDS])
+        for i in range(0, len(notes), NOTE_WORDS)
+    ]
 
 
-def part2(notes):
-    return sum(decode(note) for note in notes)
+def decode_lines(lines: list[str]) -> list[int]:
+    return decode_all(parse_masks(lines))
+
+
+def decode_stream(
+    lines: Iterable[str], chunk_size: int = CHUNK_SIZE, jobs: int = None
+) -> Iterator[int]:
+    """Output values of a stream of notes, in order.
+    Chunks of notes are parsed and decoded in a process pool (jobs=None means one
+    worker per CPU), with at most two chunks per worker in flight so that the
+    stream is never read far ahead.
+    """
+    lines = iter(lines)
+    chunks = iter(lambda: list(it.islice(lines, chunk_size)), [])
+    jobs = jobs or os.cpu_count()
+    if jobs == 1:
+        for chunk in chunks:
+            yield from decode_lines(chunk)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending = collections.deque()
+        for chunk in chunks:
+            pending.append(pool.submit(decode_lines, chunk))
+            if len(pending) >= 2 * jobs:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+@profiled
+def part2(notes: array):
+    return sum(decode_all(notes))
 
 
 #################
 
 
 def prepare_input():
-    input_ = read_input("08")
-    lines = [line for line in input_.strip().split("\n")]
-    parsed = [[part.split() for part in line.split("|")] for line in lines]
-    return parsed
+    return parse_masks(iter_lines("08"))
 
 
 def main():
@@ -78,4 +150,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
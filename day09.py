@@ -1,73 +1,90 @@
 import math
 from collections import deque
-from dataclasses import dataclass
-from itertools import product
 
-from utils import read_input
+from grid import Grid2D
+from utils import cached_parse, iter_lines, optional_import, profiled
 
+np = optional_import("numpy")
 
-@dataclass
-class Caves:
-    grid: list[list[int]]
+NUMPY_THRESHOLD = 4096
 
-    @property
-    def M(self):
-        return len(self.grid)
 
-    @property
-    def N(self):
-        return len(self.grid[0])
+class Caves(Grid2D):
+    """Heights, padded with 9s: a 9 is never a low point nor part of a basin.
+    """
 
-    def neighbors_idx(self, i, j):
-        return [
-            (i + dx, j + dy)
-            for dx, dy in [(1, 0), (-1, 0), (0, 1), (0, -1)]
-            if 0 <= i + dx < self.M and 0 <= j + dy < self.N
-        ]
+    def __init__(self, grid: list[list[int]]):
+        super().__init__(grid, pad=9, typecode="B")
 
-    def neighbors(self, i, j):
-        return [self.grid[nx][ny] for nx, ny in self.neighbors_idx(i, j)]
+    def is_low_point(self, k):
+        height = self.cells[k]
+        return all(height < self.cells[k + offset] for offset in self.offsets4)
 
-    def is_low_point(self, i, j):
-        return all(self.grid[i][j] < neighbor for neighbor in self.neighbors(i, j))
-
-    def basin_size(self, i, j):
-        """(i,j) should be a low point!
+    def basin_size(self, k):
+        """k should be a low point!
         """
+        cells = self.cells
         q = deque()
         visited = set()
-        q.append((i, j))
+        q.append(k)
         while q:
             location = q.popleft()
-            x, y = location
             visited.add(location)
-            for (nx, ny) in self.neighbors_idx(x, y):
-                if (nx, ny) not in visited and self.grid[x][y] < self.grid[nx][ny] < 9:
-                    q.append((nx, ny))
+            for offset in self.offsets4:
+                nbr = location + offset
+                if nbr not in visited and cells[location] < cells[nbr] < 9:
+                    q.append(nbr)
         return len(visited)
 
 
+def low_points_np(caves: Caves):
+    """(i, j) of every low point as an (n, 2) array, and the sum of their risk
+    levels, from four comparisons of the padded heights with their shifts.
+    """
+    heights = np.frombuffer(caves.cells, dtype=np.uint8).reshape(-1, caves.width)
+    inner = heights[1:-1, 1:-1]
+    low = (
+        (inner < heights[:-2, 1:-1])
+        & (inner < heights[2:, 1:-1])
+        & (inner < heights[1:-1, :-2])
+        & (inner < heights[1:-1, 2:])
+    )
+    risk = int(inner[low].sum(dtype=np.int64)) + int(np.count_nonzero(low))
+    return np.argwhere(low), risk
+
+
+def use_numpy(caves: Caves) -> bool:
+    return np is not None and caves.M * caves.N >= NUMPY_THRESHOLD
+
+
+def low_points(caves: Caves) -> list[int]:
+    """Flat indices of the low points.
+    """
+    if use_numpy(caves):
+        coords, _ = low_points_np(caves)
+        return [caves.idx(i, j) for i, j in coords.tolist()]
+    return [k for k in caves.interior_idx() if caves.is_low_point(k)]
+
+
+@profiled
 def part1(caves):
+    if use_numpy(caves):
+        _, risk = low_points_np(caves)
+        return risk
     return sum(
-        1 + caves.grid[i][j]
-        for i, j in product(range(caves.M), range(caves.N))
-        if caves.is_low_point(i, j)
+        1 + caves.cells[k] for k in caves.interior_idx() if caves.is_low_point(k)
     )
 
 
+@profiled
 def part2(caves):
-    low_points = [
-        (i, j)
-        for i, j in product(range(caves.M), range(caves.N))
-        if caves.is_low_point(i, j)
-    ]
-    basin_sizes = [caves.basin_size(*low_point) for low_point in low_points]
+    basin_sizes = [caves.basin_size(low_point) for low_point in low_points(caves)]
     return math.prod(sorted(basin_sizes)[-3:])
 
 
+@cached_parse("09")
 def prepare_input():
-    input_ = read_input("09")
-    grid = [[int(c) for c in row] for row in input_.strip().split("\n")]
+    grid = [[int(c) for c in row] for row in iter_lines("09")]
     return grid
 
 
@@ -1,6 +1,6 @@
 from functools import reduce
 
-from utils import read_input
+from utils import iter_lines, profiled
 
 openers = ("(", "[", "{", "<")
 closers = (")", "]", "}", ">")
@@ -25,6 +25,7 @@ def find_illegals(line):
     return illegals
 
 
+@profiled
 def part1(lines):
     return sum(
         illegal_vals[illegals[0]] if (illegals := find_illegals(line)) else 0
@@ -55,6 +56,7 @@ def completion_score(line):
         )
 
 
+@profiled
 def part2(lines):
     scores = [score for line in lines if (score := completion_score(line))]
     N = len(scores)
@@ -65,7 +67,7 @@ def part2(lines):
 
 
 def prepare_input():
-    return read_input("10").strip().split("\n")
+    return list(iter_lines("10"))
 
 
 def main():
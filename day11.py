@@ -1,78 +1,62 @@
-from dataclasses import dataclass
-from itertools import product
+from grid import Grid2D
+from utils import cached_parse, iter_lines, profiled
 
-from utils import read_input
 
+class Octopi(Grid2D):
+    """Energy levels, padded with a level so low that the padding never flashes.
+    """
 
-@dataclass
-class Octopi:
-    grid: list[list[int]]
-
-    @property
-    def M(self):
-        return len(self.grid)
-
-    @property
-    def N(self):
-        return len(self.grid[0])
+    def __init__(self, grid: list[list[int]]):
+        super().__init__(grid, pad=-(10 ** 9))
 
     @property
     def flashed_idx(self):
-        return [
-            (i, j)
-            for i, j in product(range(self.M), range(self.N))
-            if self.grid[i][j] > 9
-        ]
-
-    def neighbors_idx(self, i, j):
-        return [
-            (i + dx, j + dy)
-            for dx, dy in product((-1, 0, 1), repeat=2)
-            if 0 <= i + dx < self.M and 0 <= j + dy < self.N and (dx, dy) != (0, 0)
-        ]
-
-    def neighbors(self, i, j):
-        return [self.grid[nx][ny] for nx, ny in self.neighbors_idx(i, j)]
+        return [k for k in self.interior_idx() if self.cells[k] > 9]
 
     def update(self):
-        for i, j in product(range(self.M), range(self.N)):
-            self.grid[i][j] += 1
+        cells = self.cells
+        for k in self.interior_idx():
+            cells[k] += 1
 
         seen = set()
         flashed_before = set(self.flashed_idx)
         stack = self.flashed_idx[:]
         while stack:
-            i, j = loc = stack.pop()
+            loc = stack.pop()
             if loc in seen:
                 continue
             else:
                 seen.add(loc)
-            for nx, ny in self.neighbors_idx(*loc):
-                self.grid[nx][ny] += 1
-                if self.grid[nx][ny] > 9 and (nx, ny) not in flashed_before:
-                    stack.append((nx, ny))
+            for offset in self.offsets8:
+                nbr = loc + offset
+                cells[nbr] += 1
+                if cells[nbr] > 9 and nbr not in flashed_before:
+                    stack.append(nbr)
 
         flash_count = len(self.flashed_idx)
-        for i, j in self.flashed_idx:
-            self.grid[i][j] = 0
+        for k in self.flashed_idx:
+            cells[k] = 0
 
         return flash_count
 
 
+@profiled
 def part1(octopi):
     return sum(octopi.update() for _ in range(100))
 
 
+@profiled
 def part2(octopi):
     step = 0
-    while (total := sum(sum(row) for row in octopi.grid)) != 0:
+    while any(octopi.values()):
         step += 1
         octopi.update()
     return step
 
 
+@cached_parse("11")
 def prepare_input():
-    return [[int(c) for c in line] for line in read_input("11").strip().split("\n")]
+    return [[int(c) for c in line] for line in iter_lines("11")]
 
 
 def main():
@@ -2,7 +2,7 @@ from collections import defaultdict
 from dataclasses import dataclass, field
 from os import read
 
-from utils import read_input
+from utils import iter_lines, profiled
 
 Vertex = str
 
@@ -75,17 +75,18 @@ class Graph:
         return out
 
 
+@profiled
 def part1(graph: Graph):
     return len(graph.paths1("start", "end"))
 
 
+@profiled
 def part2(graph: Graph):
     return len(graph.paths2("start", "end"))
 
 
 def prepare_input():
-    input_ = read_input("12")
-    return [edge.split("-") for edge in input_.strip().split("\n")]
+    return [edge.split("-") for edge in iter_lines("12")]
 
 
 def main():
@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from operator import itemgetter
 from typing import NamedTuple
 
-from utils import read_input
+from utils import iter_blocks, profiled
 
 
 class FoldInstruction(NamedTuple):
@@ -49,10 +49,12 @@ class Paper:
         return Paper(new_dots)
 
 
+@profiled
 def part1(paper: Paper, fold_instructions: list[FoldInstruction]):
     return len(paper.fold(fold_instructions[0]).dots)
 
 
+@profiled
 def part2(paper: Paper, fold_instructions: list[FoldInstruction]):
     for fold_instr in fold_instructions:
         paper = paper.fold(fold_instr)
@@ -65,8 +67,7 @@ def part2(paper: Paper, fold_instructions: list[FoldInstruction]):
 
 
 def prepare_input():
-    input_ = read_input("13").strip()
-    raw_dots, raw_folds = input_.split("\n\n")
+    raw_dots, raw_folds = iter_blocks("13")
     dots = [
         (int(a), int(b))
         for (a, b) in [line.split(",") for line in raw_dots.split("\n")]
@@ -2,7 +2,7 @@ import re
 from collections import Counter
 from typing import NamedTuple
 
-from utils import read_input
+from utils import iter_blocks, profiled
 
 Template = str
 
@@ -64,6 +64,7 @@ def double_to_single_counts(double_counts, initial_template: Template):
 ######################
 
 
+@profiled
 def part1(template: Template, rules: list[InsertionRule]):
     for _ in range(10):
         template = process(template, rules)
@@ -72,6 +73,7 @@ def part1(template: Template, rules: list[InsertionRule]):
     return ranked[0][1] - ranked[-1][1]
 
 
+@profiled
 def part2(template: Template, rules: list[InsertionRule]):
     double_counts = pairs(template)
     for _ in range(40):
@@ -85,8 +87,7 @@ def part2(template: Template, rules: list[InsertionRule]):
 
 
 def prepare_input() -> tuple[Template, list[InsertionRule]]:
-    input_ = read_input("14")
-    template, raw_rules = input_.strip().split("\n\n")
+    template, raw_rules = iter_blocks("14")
     rules = [InsertionRule.parse(line) for line in raw_rules.split("\n")]
     return template, rules
 
@@ -1,69 +1,54 @@
 import heapq
-from dataclasses import dataclass
 from itertools import product
 
-from utils import read_input
+from grid import Grid2D
+from utils import cached_parse, iter_lines, profiled
 
 
-@dataclass
-class Cavern:
-    grid: list[list[int]]
-
-    @property
-    def M(self):
-        return len(self.grid)
-
-    @property
-    def N(self):
-        return len(self.grid[0])
-
-    def neighbors_idx(self, i, j):
-        return [
-            (i + dx, j + dy)
-            for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]
-            if 0 <= i + dx < self.M and 0 <= j + dy < self.N and (dx, dy) != (0, 0)
-        ]
-
-    def neighbors(self, i, j):
-        return [self.grid[nx][ny] for nx, ny in self.neighbors_idx(i, j)]
+class Cavern(Grid2D):
+    def __init__(self, grid: list[list[int]]):
+        super().__init__(grid, pad=0)
 
 
 def dijkstra(cavern: Cavern):
-    """Distances to (0,0) in cavern"""
-    distance_from_origin = {
-        (i, j): float("inf") for (i, j) in product(range(cavern.M), range(cavern.N))
-    }
-    heap = [(dist, loc) for loc, dist in distance_from_origin.items()]
-    heapq.heapify(heap)
-    distance_from_origin[(0, 0)] = 0
-    unseen = set(distance_from_origin)
-    while unseen:
+    """Distances to (0,0) in cavern, by flat index.
+    Padding cells start at distance 0, so they are never relaxed.
+    """
+    cells = cavern.cells
+    distance_from_origin = [0] * len(cells)
+    for k in cavern.interior_idx():
+        distance_from_origin[k] = float("inf")
+    origin = cavern.idx(0, 0)
+    distance_from_origin[origin] = 0
+    heap = [(0, origin)]
+    while heap:
         dist_to_loc, loc = heapq.heappop(heap)
-        unseen.remove(loc)
-        for nbr in cavern.neighbors_idx(*loc):
-            x, y = nbr
-            new_dist = distance_from_origin[loc] + cavern.grid[x][y]
+        if dist_to_loc > distance_from_origin[loc]:
+            continue  # stale entry
+        for offset in cavern.offsets4:
+            nbr = loc + offset
+            new_dist = dist_to_loc + cells[nbr]
             if new_dist < distance_from_origin[nbr]:
                 distance_from_origin[nbr] = new_dist
                 heapq.heappush(heap, (new_dist, nbr))
     return distance_from_origin
 
 
+@profiled
 def part1(cavern: Cavern):
     distance_from_origin = dijkstra(cavern)
-    return distance_from_origin[(cavern.M - 1, cavern.N - 1)]
+    return distance_from_origin[cavern.idx(cavern.M - 1, cavern.N - 1)]
 
 
+@profiled
 def part2(cavern: Cavern):
     MM, NN = 5 * cavern.M, 5 * cavern.N
-    big_grid = [[0] * NN for _ in range(NN)]
+    big_grid = [[0] * NN for _ in range(MM)]
     for (i, j) in product(range(MM), range(NN)):
         div_i, rem_i = divmod(i, cavern.M)
         div_j, rem_j = divmod(j, cavern.N)
         big_grid[i][j] = (
-            val
-            if (val := (cavern.grid[rem_i][rem_j] + div_i + div_j)) < 10
-            else val - 9
+            val if (val := (cavern[rem_i, rem_j] + div_i + div_j)) < 10 else val - 9
         )
     big_cavern = Cavern(big_grid)
     return part1(big_cavern)
@@ -72,9 +57,9 @@ def part2(cavern: Cavern):
 ##############
 
 
+@cached_parse("15", version=2)
 def prepare_input():
-    input_ = read_input("15")
-    grid = [[int(c) for c in row] for row in input_.strip().split("\n")]
+    grid = [[int(c) for c in row] for row in iter_lines("15")]
     return Cavern(grid)
 
 
@@ -3,7 +3,7 @@ from dataclasses import dataclass, field
 from math import prod
 from typing import Optional
 
-from utils import read_input
+from utils import profiled, read_input
 
 HEX_TO_BIN_STRING = """0 = 0000
 1 = 0001
@@ -120,10 +120,12 @@ class Packet:
         return s
 
 
+@profiled
 def part1():
     return sum(packet_versions)
 
 
+@profiled
 def part2(packet):
     return packet.value
 
@@ -2,7 +2,7 @@ import re
 from dataclasses import dataclass
 from typing import NamedTuple
 
-from utils import read_input
+from utils import profiled, read_input
 
 
 def sgn(num):
@@ -63,6 +63,7 @@ class Probe:
         return None
 
 
+@profiled
 def part1(target: Target):
     v_bound = 159
     probes = [
@@ -73,6 +74,7 @@ def part1(target: Target):
     return max(max_y for probe in probes if (max_y := probe.max_height(target)))
 
 
+@profiled
 def part2(target):
     v_bound = 159
     probes = [
@@ -5,7 +5,7 @@ from functools import reduce
 from itertools import chain, combinations, islice, tee
 from typing import Iterator, Optional, Union
 
-from utils import read_input
+from utils import cached_parse, iter_lines, profiled
 
 
 @dataclass
@@ -147,11 +147,13 @@ class SnailNode:
             raise ValueError
 
 
+@profiled
 def part1(snail_nums: list[SnailNode]):
     total = reduce(lambda x, y: x + y, snail_nums)
     return total.magnitude()
 
 
+@profiled
 def part2(snail_nums: list[SnailNode]):
     snail_num_pairs = combinations(snail_nums, 2)
     magnitudes_of_sums = (
@@ -160,9 +162,9 @@ def part2(snail_nums: list[SnailNode]):
     return max(chain.from_iterable(magnitudes_of_sums))
 
 
+@cached_parse("18")
 def prepare_input():
-    input_ = read_input("18").strip().split("\n")
-    return [SnailNode.parse(eval(line)) for line in input_]
+    return [SnailNode.parse(eval(line)) for line in iter_lines("18")]
 
 
 def main():
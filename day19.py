@@ -3,7 +3,7 @@
 from dataclasses import dataclass
 from itertools import combinations, product
 
-from utils import read_input
+from utils import iter_blocks, profiled
 
 Vector = tuple[int, int, int]
 
@@ -87,6 +87,7 @@ class Scanner:
                         return translated
 
 
+@profiled
 def part1(scanners: list[Scanner]):
     known_beacons = set(scanners[0].beacons)
     matches = {0}
@@ -111,6 +112,7 @@ def mhtn_norm(u: Vector, v: Vector):
 translations = []
 
 
+@profiled
 def part2(scanners):
     beacons = part1(scanners)
     print(len(beacons))
@@ -118,8 +120,7 @@ def part2(scanners):
 
 
 def prepare_input():
-    input_ = read_input("19").strip().split("\n\n")
-    raw_scanners = [block.strip().split("\n")[1:] for block in input_]
+    raw_scanners = [block.split("\n")[1:] for block in iter_blocks("19")]
     scanners = [
         [tuple(map(int, line.split(","))) for line in scanner]
         for scanner in raw_scanners
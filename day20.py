@@ -1,8 +1,8 @@
 # pylint: disable=F0401
 
-import numpy as np
+from utils import iter_blocks, lazy_import, profiled
 
-from utils import read_input
+np = lazy_import("numpy")
 
 
 def pad(image, n, val):
@@ -30,11 +30,13 @@ def enhance_twice_and_trim(image, algorithm):
     return trimmed
 
 
+@profiled
 def part1(image, algorithm):
     enhanced = enhance_twice_and_trim(image, algorithm)
     return np.count_nonzero(enhanced.astype("int32"))
 
 
+@profiled
 def part2(image, algorithm):
     for _ in range(25):
         image = enhance_twice_and_trim(image, algorithm)
@@ -42,7 +44,7 @@ def part2(image, algorithm):
 
 
 def prepare_input():
-    algorithm, image = read_input("20").strip().split("\n\n")
+    algorithm, image = iter_blocks("20")
     # algorithm, image = test_input.strip().split("\n\n")
     algorithm = algorithm.replace("\n", "")
     lines_str = image.strip().split("\n")
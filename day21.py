@@ -5,6 +5,8 @@ from functools import cache
 from itertools import cycle, islice, product
 from typing import NamedTuple
 
+from utils import profiled
+
 
 @dataclass
 class GameState:
@@ -32,6 +34,7 @@ def deterministic_die(n):
     return cycle(range(1, n + 1))
 
 
+@profiled
 def part1(scores, positions):
     die = deterministic_die(100)
     N_rolls = 0
@@ -108,6 +111,7 @@ def ways_to_reach(state: State, initial_state: State):
     return sum(ways_to_reach(prev_state, initial_state) for prev_state in prev_states)
 
 
+@profiled
 def part2(initial_state: State):
     winning_states_0 = (
         State(scores=(s0, s1), positions=(p0, p1), turn=1)
@@ -7,7 +7,7 @@ from itertools import product, starmap
 from math import prod
 from typing import NamedTuple
 
-from utils import read_input
+from utils import cached_parse, iter_lines, profiled
 
 
 class Command(Enum):
@@ -128,6 +128,7 @@ class RebootStep(NamedTuple):
         return RebootStep(cmd=cmd, cuboid=Cuboid(x, y, z))
 
 
+@profiled
 def part1(steps: list[RebootStep]):
     cubes = Counter()
     for cmd, new_cube in steps:
@@ -141,9 +142,9 @@ def part1(steps: list[RebootStep]):
     return sum(count * cube.volume() for cube, count in cubes.items())
 
 
+@cached_parse("22")
 def prepare_input():
-    input_ = read_input("22").strip().split("\n")
-    return [RebootStep.parse(line) for line in input_]
+    return [RebootStep.parse(line) for line in iter_lines("22")]
 
 
 def main():
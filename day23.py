@@ -3,6 +3,8 @@ from dataclasses import dataclass
 from itertools import chain, product
 from typing import ClassVar, NamedTuple
 
+from utils import profiled
+
 Amphipod = str
 
 
@@ -160,6 +162,7 @@ class BurrowState:
         )
 
 
+@profiled
 def part1(start_state: BurrowState):
     """BFS to find all possible ways of moving amphipods to their rooms.
     Since the same arrangement can be reached via different moves, keep track of 
@@ -187,6 +190,7 @@ def part1(start_state: BurrowState):
     return best
 
 
+@profiled
 def part2(start_state: BurrowState):
     """Adjusts state for part 2, then calls part 1.
     """
@@ -3,7 +3,7 @@
 from itertools import zip_longest
 from typing import NamedTuple, Optional
 
-from utils import read_input
+from utils import iter_lines, profiled
 
 
 class ALU(dict):
@@ -170,16 +170,18 @@ def backwards(
     return new_best
 
 
+@profiled
 def part1(instruction_blocks: list[list[Instruction]]):
-    cur = {0: [0] * 14}
-    for idx in reversed(range(14)):
+    cur = {0: [0] * len(instruction_blocks)}
+    for idx in reversed(range(len(instruction_blocks))):
         cur = backwards(idx, instruction_blocks, cur)
     return "".join(str(n) for n in max(cur.values()))
 
 
+@profiled
 def part2(instruction_blocks: list[list[Instruction]]):
-    cur = {0: [0] * 14}
-    for idx in reversed(range(14)):
+    cur = {0: [0] * len(instruction_blocks)}
+    for idx in reversed(range(len(instruction_blocks))):
         cur = backwards(idx, instruction_blocks, cur, min)
     return "".join(str(n) for n in min(cur.values()))
 
@@ -188,7 +190,7 @@ def part2(instruction_blocks: list[list[Instruction]]):
 
 
 def prepare_input():
-    input_ = read_input("24").strip().split("\n")
+    input_ = list(iter_lines("24"))
     inp_idx = [i for i, line in enumerate(input_) if line.startswith("inp")]
     instructions = [Instruction.from_str(line) for line in input_]
     instruction_blocks = [
@@ -1,51 +1,48 @@
 # pylint: disable=F0401
 
-from dataclasses import dataclass
-from itertools import product
-
-from utils import read_input
+from grid import Grid2D
+from utils import iter_lines, profiled
 
 Char = str
 
 
-@dataclass
-class Trench:
-    grid: list[list[Char]]
+EMPTY, EAST, SOUTH = map(ord, ".>v")
+
+
+class Trench(Grid2D):
+    """Sea cucumbers stored as byte codes of their characters.
+    """
 
-    def __getitem__(self, idx):
-        return self.grid[idx]
+    def __init__(self, grid: list[list[Char]]):
+        rows = [[ord(c) for c in row] for row in grid]
+        super().__init__(rows, pad=EMPTY, typecode="B")
 
     def __str__(self):
-        return "\n".join("".join(row) for row in self)
-
-    @property
-    def M(self):
-        return len(self.grid)
-
-    @property
-    def N(self):
-        return len(self[0])
-
-    def transpose(self) -> "Trench":
-        d = {".": ".", "v": ">", ">": "v"}
-        new_grid = [[d[c] for c in row] for row in self]
-        return Trench([list(row) for row in zip(*new_grid)])
-
-    def move_right(self) -> "Trench":
-        new_grid = []
-        for row in self:
-            new_row = row[:]
-            for i in range(self.N):
-                if row[i] == ">" and row[(i + 1) % self.N] == ".":
-                    new_row[i] = "."
-                    new_row[(i + 1) % self.N] = ">"
-            new_grid.append(new_row)
-        return Trench(new_grid)
+        return "\n".join("".join(map(chr, row)) for row in self.rows())
+
+    def move(self, herd: int, destination) -> "Trench":
+        """Move every member of the herd whose destination is empty, at once.
+        destination maps flat indices to flat indices, see Grid2D.shifted_idx.
+        """
+        cells = self.cells
+        movers = [
+            k
+            for k, c in enumerate(cells)  # padding is EMPTY, never part of a herd
+            if c == herd and cells[destination[k]] == EMPTY
+        ]
+        out = self.copy()
+        for k in movers:
+            out.cells[k] = EMPTY
+            out.cells[destination[k]] = herd
+        return out
 
     def update(self) -> "Trench":
-        return self.move_right().transpose().move_right().transpose()
+        return self.move(EAST, self.shifted_idx(0, 1)).move(
+            SOUTH, self.shifted_idx(1, 0)
+        )
 
 
+@profiled
 def part1(trench: Trench):
     count = 0
     while trench != (updated := trench.update()):
@@ -55,8 +52,7 @@ def part1(trench: Trench):
 
 
 def prepare_input():
-    input_ = read_input("25").strip().split("\n")
-    return Trench([list(line) for line in input_])
+    return Trench([list(line) for line in iter_lines("25")])
 
 
 def main():
@@ -0,0 +1,529 @@
+"""Synthetic puzzle inputs of any size, in the format of each day's input file.
+
+    python generators.py 5 100000            # 100000 vent segments on stdout
+    python generators.py 15 500 --seed 3     # a 500 x 500 risk grid
+
+What size means depends on the day, see the generator functions. Days 21 and 23
+have no generator since their input is hard-coded in the solution.
+"""
+
+import argparse
+import itertools
+import os
+import random
+import string
+from typing import Callable
+
+Generator = Callable[[int, random.Random], str]
+
+MAX_ATTEMPTS = 100
+
+
+def depth_readings(size: int, rng: random.Random) -> str:
+    """Day 1: size depth readings, a random walk that stays positive."""
+    depth = 100
+    out = []
+    for _ in range(size):
+        depth = max(1, depth + rng.randint(-10, 20))
+        out.append(str(depth))
+    return "\n".join(out)
+
+
+def course(size: int, rng: random.Random) -> str:
+    """Day 2: size submarine commands."""
+    directions = rng.choices(["forward", "down", "up"], weights=[5, 3, 2], k=size)
+    return "\n".join(f"{d} {rng.randint(1, 9)}" for d in directions)
+
+
+def diagnostic_report(size: int, rng: random.Random) -> str:
+    """Day 3: size distinct binary words.
+    Reports where the CO2 filter runs out of candidates are drawn again.
+    """
+    from day03 import filter_down
+
+    bits = max(12, size.bit_length() + 2)
+    for _ in range(MAX_ATTEMPTS):
+        words = [f"{n:0{bits}b}" for n in rng.sample(range(2**bits), size)]
+        try:
+            filter_down(words, True)
+            filter_down(words, False)
+        except ValueError:
+            continue
+        return "\n".join(words)
+    raise ValueError(f"no valid report of size {size} found")
+
+
+def bingo(size: int, rng: random.Random) -> str:
+    """Day 4: size boards. Every number is drawn, so every board wins."""
+    draws = rng.sample(range(100), 100)
+    boards = []
+    for _ in range(size):
+        nums = rng.sample(range(100), 25)
+        rows = [nums[i : i + 5] for i in range(0, 25, 5)]
+        boards.append("\n".join(" ".join(f"{n:2d}" for n in row) for row in rows))
+    return "\n\n".join([",".join(map(str, draws))] + boards)
+
+
+def vents(size: int, rng: random.Random, coord_range: int = 1000) -> str:
+    """Day 5: size horizontal, vertical or diagonal segments in
+    [0, coord_range) x [0, coord_range).
+    """
+    out = []
+    for _ in range(size):
+        x1, y1 = rng.randrange(coord_range), rng.randrange(coord_range)
+        kind = rng.randrange(3)
+        if kind == 0:
+            x2, y2 = rng.randrange(coord_range), y1
+        elif kind == 1:
+            x2, y2 = x1, rng.randrange(coord_range)
+        else:
+            length = rng.randrange(coord_range)
+            dx, dy = rng.choice([1, -1]), rng.choice([1, -1])
+            length = min(
+                length,
+                coord_range - 1 - x1 if dx > 0 else x1,
+                coord_range - 1 - y1 if dy > 0 else y1,
+            )
+            x2, y2 = x1 + dx * length, y1 + dy * length
+        out.append(f"{x1},{y1} -> {x2},{y2}")
+    return "\n".join(out)
+
+
+def lanternfish(size: int, rng: random.Random) -> str:
+    """Day 6: size timers."""
+    return ",".join(str(rng.randint(1, 5)) for _ in range(size))
+
+
+def crabs(size: int, rng: random.Random) -> str:
+    """Day 7: size crab positions, spread over about as many positions."""
+    spread = max(2, size)
+    return ",".join(str(rng.randrange(spread)) for _ in range(size))
+
+
+DIGIT_SEGMENTS = [
+    "abcefg",
+    "cf",
+    "acdeg",
+    "acdfg",
+    "bcdf",
+    "abdfg",
+    "abdefg",
+    "acf",
+    "abcdefg",
+    "abcdfg",
+]
+
+
+def displays(size: int, rng: random.Random) -> str:
+    """Day 8: size notes, each with its own wire permutation."""
+    out = []
+    for _ in range(size):
+        wiring = dict(zip("abcdefg", rng.sample("abcdefg", 7)))
+
+        def scramble(segments):
+            return "".join(rng.sample([wiring[c] for c in segments], len(segments)))
+
+        patterns = [scramble(s) for s in rng.sample(DIGIT_SEGMENTS, 10)]
+        outputs = [scramble(rng.choice(DIGIT_SEGMENTS)) for _ in range(4)]
+        out.append(f"{' '.join(patterns)} | {' '.join(outputs)}")
+    return "\n".join(out)
+
+
+def digit_grid(M: int, N: int, rng: random.Random, lo=0, hi=9) -> str:
+    return "\n".join(
+        "".join(str(rng.randint(lo, hi)) for _ in range(N)) for _ in range(M)
+    )
+
+
+def height_map(size: int, rng: random.Random) -> str:
+    """Day 9: size x size heights."""
+    return digit_grid(size, size, rng)
+
+
+def navigation(size: int, rng: random.Random, length: int = 100) -> str:
+    """Day 10: size lines, about half corrupted and half incomplete."""
+    pairs = dict(zip("([{<", ")]}>"))
+    out = []
+    for _ in range(size):
+        line, stack = [], []
+        while len(line) < length or not stack:
+            if stack and (rng.random() < 0.45 or len(line) + len(stack) >= length):
+                line.append(pairs[stack.pop()])
+            else:
+                stack.append(rng.choice("([{<"))
+                line.append(stack[-1])
+        closers = [i for i, c in enumerate(line) if c in ")]}>"]
+        if closers and rng.random() < 0.5:  # corrupt a closer
+            idx = rng.choice(closers)
+            line[idx] = rng.choice([c for c in ")]}>" if c != line[idx]])
+        out.append("".join(line))
+    return "\n".join(out)
+
+
+def octopi(size: int, rng: random.Random, max_steps: int = 1000) -> str:
+    """Day 11: size x size energy levels.
+    Grids that do not synchronize within max_steps are drawn again.
+    """
+    from day11 import Octopi
+
+    for _ in range(MAX_ATTEMPTS):
+        rows = [[rng.randint(4, 9) for _ in range(size)] for _ in range(size)]
+        grid = Octopi(rows)
+        for _ in range(max_steps):
+            grid.update()
+            if not any(grid.values()):
+                return "\n".join("".join(map(str, row)) for row in rows)
+    raise ValueError(f"no synchronizing {size} x {size} grid found")
+
+
+def caves(size: int, rng: random.Random) -> str:
+    """Day 12: size small caves and about size / 3 big caves.
+    Big caves are never adjacent, or there would be infinitely many paths.
+    """
+    names = ["".join(p) for p in itertools.product(string.ascii_lowercase, repeat=2)]
+    small = rng.sample(names, size)
+    big = [name.upper() for name in rng.sample(names, max(1, size // 3))]
+    edges = set()
+    for cave in ["start", "end"] + big:
+        for nbr in rng.sample(small, min(2, size)):
+            edges.add((cave, nbr))
+    for a, b in itertools.combinations(small, 2):
+        if rng.random() < 2 / size:
+            edges.add((a, b))
+    return "\n".join(f"{a}-{b}" for a, b in sorted(edges))
+
+
+def transparent_paper(size: int, rng: random.Random, folds: int = 6) -> str:
+    """Day 13: size dots, and folds that take the paper down to 40 x 6."""
+    width, height = 40, 6
+    instructions = []
+    for n in range(folds):
+        if n % 2 == 0:
+            instructions.append(("x", width))
+            width = 2 * width + 1
+        else:
+            instructions.append(("y", height))
+            height = 2 * height + 1
+    dots = set()
+    while len(dots) < min(size, 40 * 6 * 2**folds):
+        x, y = rng.randrange(40), rng.randrange(6)
+        for axis, loc in instructions:  # unfold at random
+            if rng.random() < 0.5:
+                if axis == "x":
+                    x = 2 * loc - x
+                else:
+                    y = 2 * loc - y
+        dots.add((x, y))
+    raw_dots = "\n".join(f"{x},{y}" for x, y in dots)
+    raw_folds = "\n".join(
+        f"fold along {axis}={loc}" for axis, loc in reversed(instructions)
+    )
+    return f"{raw_dots}\n\n{raw_folds}"
+
+
+def polymer(size: int, rng: random.Random, letters: str = "BCFHKNOPSV") -> str:
+    """Day 14: a template of length size and a rule for every pair of letters."""
+    template = "".join(rng.choices(letters, k=size))
+    rules = [
+        f"{a}{b} -> {rng.choice(letters)}"
+        for a, b in itertools.product(letters, repeat=2)
+    ]
+    return template + "\n\n" + "\n".join(rules)
+
+
+def risk_grid(size: int, rng: random.Random) -> str:
+    """Day 15: size x size risk levels."""
+    return digit_grid(size, size, rng, lo=1)
+
+
+def packet_bits(literals: int, rng: random.Random) -> str:
+    """Bits of a packet containing the given number of literal packets."""
+    version = f"{rng.randrange(8):03b}"
+    if literals == 1:
+        value = f"{rng.randrange(1 << 16):b}"
+        value = "0" * (-len(value) % 4) + value
+        groups = [value[i : i + 4] for i in range(0, len(value), 4)]
+        return (
+            version
+            + "100"
+            + "".join(
+                ("0" if i == len(groups) - 1 else "1") + group
+                for i, group in enumerate(groups)
+            )
+        )
+
+    type_id = rng.choice([0, 1, 2, 3]) if literals != 2 else rng.choice(range(8))
+    if type_id == 4:
+        type_id = 0
+    if type_id >= 5:
+        splits = [1, 1]
+    else:
+        n_children = rng.randint(2, min(literals, 4))
+        cuts = sorted(rng.sample(range(1, literals), n_children - 1))
+        splits = [b - a for a, b in zip([0] + cuts, cuts + [literals])]
+    children = "".join(packet_bits(n, rng) for n in splits)
+    if rng.random() < 0.5 and len(children) < (1 << 15):
+        header = "0" + f"{len(children):015b}"
+    else:
+        header = "1" + f"{len(splits):011b}"
+    return version + f"{type_id:03b}" + header + children
+
+
+def transmission(size: int, rng: random.Random) -> str:
+    """Day 16: one packet containing size literal packets."""
+    bits = packet_bits(size, rng)
+    bits += "0" * (-len(bits) % 4)
+    return f"{int(bits, 2):0{len(bits) // 4}X}"
+
+
+def trick_shot(size: int, rng: random.Random) -> str:
+    """Day 17: a target about size wide.
+    Its x range contains a triangular number, where some probe stops moving
+    sideways, so high shots can land. The solution only tries velocities below
+    159, so size is capped at 50.
+    """
+    size = min(size, 50)
+    k = 1
+    while k * (k + 1) // 2 < size:
+        k += 1
+    k += rng.randint(0, 2)
+    stop = k * (k + 1) // 2
+    x_lo = max(1, stop - rng.randint(0, size // 2))
+    y_hi = -rng.randint(size, 2 * size)
+    return (
+        f"target area: x={x_lo}..{stop + rng.randint(1, size)},"
+        f" y={y_hi - rng.randint(1, size)}..{y_hi}"
+    )
+
+
+def snail_number(rng: random.Random, depth: int = 0) -> str:
+    if depth == 4 or (depth > 0 and rng.random() < 0.3):
+        return str(rng.randrange(10))
+    return f"[{snail_number(rng, depth + 1)},{snail_number(rng, depth + 1)}]"
+
+
+def snailfish(size: int, rng: random.Random) -> str:
+    """Day 18: size reduced snailfish numbers."""
+    return "\n".join(snail_number(rng) for _ in range(size))
+
+
+def rotations() -> list[Callable]:
+    """The 24 proper rotations of 3D space, as signed permutations of axes."""
+    out = []
+    for perm in itertools.permutations(range(3)):
+        parity = sum(perm[i] > perm[j] for i, j in itertools.combinations(range(3), 2))
+        for signs in itertools.product((1, -1), repeat=3):
+            if (-1) ** parity * signs[0] * signs[1] * signs[2] == 1:
+                out.append(
+                    lambda v, p=perm, s=signs: tuple(s[i] * v[p[i]] for i in range(3))
+                )
+    return out
+
+
+def scanners(size: int, rng: random.Random, extra: int = 10) -> str:
+    """Day 19: size scanners in a row, 1100 apart along x. The solution needs 3.
+    Neighboring scanners share at least 12 beacons, and each scanner sees some
+    more beacons around it. Reports are rotated at random.
+    """
+    positions = [
+        (1100 * n, rng.randint(-50, 50), rng.randint(-50, 50)) for n in range(size)
+    ]
+
+    def near(pos, x_lo, x_hi, spread):
+        return (
+            pos[0] + rng.randint(x_lo, x_hi),
+            pos[1] + rng.randint(-spread, spread),
+            pos[2] + rng.randint(-spread, spread),
+        )
+
+    beacons = set()
+    for pos in positions[:-1]:  # seen by this scanner and the next one
+        while sum(1 for b in beacons if pos[0] + 150 <= b[0] <= pos[0] + 950) < 12:
+            beacons.add(near(pos, 150, 950, 850))
+    for pos in positions:
+        for _ in range(extra):
+            beacons.add(near(pos, -1000, 1000, 1000))
+
+    rots = rotations()
+    blocks = []
+    for n, pos in enumerate(positions):
+        seen = [
+            tuple(b[i] - pos[i] for i in range(3))
+            for b in beacons
+            if all(abs(b[i] - pos[i]) <= 1000 for i in range(3))
+        ]
+        rotate = rots[0] if n == 0 else rng.choice(rots)
+        lines = [",".join(map(str, rotate(v))) for v in rng.sample(seen, len(seen))]
+        blocks.append(f"--- scanner {n} ---\n" + "\n".join(lines))
+    return "\n\n".join(blocks)
+
+
+def trench_map(size: int, rng: random.Random) -> str:
+    """Day 20: a random algorithm and a size x size image.
+    When the algorithm lights up dark regions, it also darkens lit ones,
+    so the lit pixels stay finite.
+    """
+    algorithm = [rng.choice(".#") for _ in range(512)]
+    if algorithm[0] == "#":
+        algorithm[511] = "."
+    image = "\n".join(
+        "".join(rng.choice(".#") for _ in range(size)) for _ in range(size)
+    )
+    return "".join(algorithm) + "\n\n" + image
+
+
+def reboot_steps(size: int, rng: random.Random, coord_range: int = 100000) -> str:
+    """Day 22: 20 steps in the initialization region, then size larger ones."""
+
+    def step(reach, max_side):
+        cmd = "on" if rng.random() < 0.6 else "off"
+        ranges = []
+        for axis in "xyz":
+            lo = rng.randint(-reach, reach - 1)
+            hi = min(reach, lo + rng.randint(1, max_side))
+            ranges.append(f"{axis}={lo}..{hi}")
+        return f"{cmd} {','.join(ranges)}"
+
+    steps = [step(50, 50) for _ in range(20)]
+    steps += [step(coord_range, coord_range // 2) for _ in range(size)]
+    return "\n".join(steps)
+
+
+MONAD_BLOCK = """inp w
+mul x 0
+add x z
+mod x 26
+div z {zz}
+add x {xx}
+eql x w
+eql x 0
+mul y 0
+add y 25
+mul y x
+add y 1
+mul z y
+mul y 0
+add y w
+add y {yy}
+mul y x
+add z y"""
+
+
+def monad(size: int, rng: random.Random) -> str:
+    """Day 24: a MONAD program for size // 2 * 2 digits that accepts some input.
+    Blocks pushing a digit onto z are matched with blocks popping it, like
+    brackets, and each pair constrains its digits to differ by at most 8.
+    """
+    n_pairs = max(1, size // 2)
+    blocks = [None] * (2 * n_pairs)
+    open_ = []
+    pushes_left = n_pairs
+    for idx in range(2 * n_pairs):
+        if pushes_left and (not open_ or rng.random() < 0.5):
+            yy = rng.randint(1, 16)
+            blocks[idx] = dict(zz=1, xx=rng.randint(10, 16), yy=yy)
+            open_.append(yy)
+            pushes_left -= 1
+        else:
+            yy_push = open_.pop()
+            blocks[idx] = dict(
+                zz=26, xx=rng.randint(-8, 8) - yy_push, yy=rng.randint(1, 16)
+            )
+    return "\n".join(MONAD_BLOCK.format(**block) for block in blocks)
+
+
+def sea_cucumbers(size: int, rng: random.Random, density: float = 0.5) -> str:
+    """Day 25: a size x size trench.
+    A full column of v and a full row of > never move, so every herd ends up
+    blocked and the simulation stops.
+    """
+    grid = [
+        [rng.choice(">v") if rng.random() < density else "." for _ in range(size)]
+        for _ in range(size)
+    ]
+    for i in range(size):
+        grid[i][0] = "v"
+    for j in range(1, size):
+        grid[0][j] = ">"
+    return "\n".join("".join(row) for row in grid)
+
+
+GENERATORS: dict[int, Generator] = {
+    1: depth_readings,
+    2: course,
+    3: diagnostic_report,
+    4: bingo,
+    5: vents,
+    6: lanternfish,
+    7: crabs,
+    8: displays,
+    9: height_map,
+    10: navigation,
+    11: octopi,
+    12: caves,
+    13: transparent_paper,
+    14: polymer,
+    15: risk_grid,
+    16: transmission,
+    17: trick_shot,
+    18: snailfish,
+    19: scanners,
+    20: trench_map,
+    22: reboot_steps,
+    24: monad,
+    25: sea_cucumbers,
+}
+
+# sizes for runner.py --sweep, small enough that each day finishes in seconds
+SWEEP_SIZES: dict[int, tuple[int, ...]] = {
+    1: (10_000, 100_000, 1_000_000),
+    2: (10_000, 100_000, 1_000_000),
+    3: (1_000, 2_000, 4_000),
+    4: (100, 400, 1_600),
+    5: (500, 1_000, 2_000),
+    6: (1_000, 10_000, 100_000),
+    7: (1_000, 10_000, 100_000),
+    8: (1_000, 10_000, 100_000),
+    9: (50, 100, 200),
+    10: (1_000, 10_000, 100_000),
+    11: (10, 20, 40),
+    12: (8, 12, 16),
+    13: (1_000, 4_000, 16_000),
+    14: (100, 400, 1_600),
+    15: (25, 50, 100),
+    16: (100, 400, 1_600),
+    17: (10, 25, 50),
+    18: (10, 20, 40),
+    19: (3, 4, 5),
+    20: (25, 50, 100),
+    22: (50, 100, 200),
+    24: (6, 10, 14),
+    25: (25, 50, 100),
+}
+
+
+def generate(day: int, size: int, seed: int = 0) -> str:
+    return GENERATORS[day](size, random.Random(seed))
+
+
+def write_input(day: int, size: int, directory: str, seed: int = 0) -> str:
+    """Write a generated input where read_input would look for it, if run from
+    directory. Returns the path of the file.
+    """
+    path = os.path.join(directory, f"day{day:02d}_input.txt")
+    with open(path, "w") as f:
+        f.write(generate(day, size, seed) + "\n")
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("day", type=int, choices=sorted(GENERATORS))
+    parser.add_argument("size", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(generate(args.day, args.size, args.seed))
+
+
+if __name__ == "__main__":
+    main()
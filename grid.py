@@ -0,0 +1,96 @@
+import copy
+from array import array
+from functools import lru_cache
+from itertools import product
+from typing import Iterator
+
+
+class Grid2D:
+    """An M x N grid stored row-major in one flat array, with a border of padding
+    cells all around it.
+
+    Cells are addressed by flat index. The neighbors of an interior cell k are
+    k + offset for offset in offsets4 (or offsets8), and they are never out of
+    range thanks to the border, so there are no bounds checks. Pick the padding
+    value so that the algorithm ignores it, e.g. 9 for the heights of day 9.
+    """
+
+    def __init__(self, rows, pad=0, typecode="q"):
+        self.M = len(rows)
+        self.N = len(rows[0])
+        self.width = width = self.N + 2
+        self.pad = pad
+        self.cells = array(typecode, [pad]) * ((self.M + 2) * width)
+        for i, row in enumerate(rows):
+            start = self.idx(i, 0)
+            self.cells[start : start + self.N] = array(typecode, row)
+        self.offsets4 = (width, -width, 1, -1)
+        self.offsets8 = tuple(
+            di * width + dj
+            for di, dj in product((-1, 0, 1), repeat=2)
+            if (di, dj) != (0, 0)
+        )
+
+    def __getitem__(self, ij):
+        i, j = ij
+        return self.cells[self.idx(i, j)]
+
+    def __setitem__(self, ij, val):
+        i, j = ij
+        self.cells[self.idx(i, j)] = val
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, Grid2D)
+            and (self.M, self.N) == (other.M, other.N)
+            and self.cells == other.cells
+        )
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.rows()!r})"
+
+    def idx(self, i: int, j: int) -> int:
+        return (i + 1) * self.width + j + 1
+
+    def coords(self, k: int) -> tuple[int, int]:
+        i, j = divmod(k, self.width)
+        return i - 1, j - 1
+
+    def interior_idx(self) -> Iterator[int]:
+        """Flat indices of the real (non-padding) cells, row by row.
+        """
+        for i in range(self.M):
+            start = self.idx(i, 0)
+            yield from range(start, start + self.N)
+
+    def values(self) -> Iterator:
+        cells = self.cells
+        return (cells[k] for k in self.interior_idx())
+
+    def rows(self) -> list[list]:
+        return [
+            self.cells[self.idx(i, 0) : self.idx(i, 0) + self.N].tolist()
+            for i in range(self.M)
+        ]
+
+    def copy(self):
+        out = copy.copy(self)
+        out.cells = array(self.cells.typecode, self.cells)
+        return out
+
+    def shifted_idx(self, di: int, dj: int) -> array:
+        """Table mapping the flat index of each cell (i, j) to that of the cell
+        (i + di, j + dj), wrapping around the edges of the grid.
+        Entries of padding cells are meaningless.
+        """
+        return _shifted_idx(self.M, self.N, di, dj)
+
+
+@lru_cache(maxsize=None)
+def _shifted_idx(M: int, N: int, di: int, dj: int) -> array:
+    width = N + 2
+    table = array("q", [0]) * ((M + 2) * width)
+    for i, j in product(range(M), range(N)):
+        ii, jj = (i + di) % M, (j + dj) % N
+        table[(i + 1) * width + j + 1] = (ii + 1) * width + jj + 1
+    return table
@@ -0,0 +1,542 @@
+"""Run and time the solutions of every day.
+
+    python runner.py                        # every day, 3 timed runs each
+    python runner.py 1 5 12 --repeats 10    # only some days
+    python runner.py --json bench.json      # also write the results as JSON
+    python runner.py --compare bench.json   # compare medians with an older run
+    python runner.py --jobs 0               # parts in parallel, one worker per CPU
+    python runner.py 5 9 --sweep            # growth over generated inputs
+    python runner.py 19 --profile profiles  # cProfile/tracemalloc reports per part
+    python runner.py --run day01            # just run one day, once
+
+prepare_input, part1 and part2 are timed separately. Each day gets one extra
+untimed run under tracemalloc first, which measures the peak memory of each stage
+and doubles as a warm-up. The import of each day is timed in a fresh interpreter
+with -X importtime, and the slowest modules it imports are listed.
+
+Days are discovered from the dayNN.py files and only imported when they run,
+and heavy dependencies (numpy) are imported lazily, see utils.lazy_import. They
+are loaded in full before a day's parts are measured, but not with --run, where
+a day only pays for them if it uses them. Their load time is part of the import
+time, listed as "numpy (lazy)" and so on.
+
+Parts running in parallel compete for memory bandwidth and caches, so use the
+parallel mode for the total wall time and in-process runs for per-part timings.
+
+--sweep runs the days on inputs from generators.py instead, at the sizes given
+by --sizes or generators.SWEEP_SIZES, and fits how the time of each stage grows
+with the size.
+"""
+
+import argparse
+import contextlib
+import hashlib
+import importlib
+import io
+import json
+import math
+import os
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+from types import ModuleType
+from typing import Any, Callable, Iterator, NamedTuple, Optional
+
+import utils
+
+# generators, concurrent.futures, subprocess and tempfile are imported where they
+# are needed, so that running a single day starts quickly.
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+STAGES = ("prepare", "part1", "part2")
+REPEATS = 3
+
+
+def discover_days() -> list[int]:
+    """Days with a dayNN.py next to this file, found without importing them."""
+    return sorted(
+        int(m.group(1))
+        for name in os.listdir(HERE)
+        if (m := re.fullmatch(r"day(\d\d)\.py", name))
+    )
+
+
+def parse_day(arg: str) -> int:
+    """Accepts 5, 05 and day05."""
+    return int(arg.removeprefix("day"))
+
+
+def call(part: str):
+    return lambda mod, data: getattr(mod, part)(data)
+
+
+class DaySpec(NamedTuple):
+    """How to feed a day's prepared input to its parts.
+    Every part is handed a freshly prepared input, since some days mutate it.
+    """
+
+    prepare: Callable[[ModuleType], Any] = lambda mod: mod.prepare_input()
+    part1: Callable[[ModuleType, Any], Any] = call("part1")
+    part2: Optional[Callable[[ModuleType, Any], Any]] = call("part2")
+
+
+def star(part: str):
+    return lambda mod, data: getattr(mod, part)(*data)
+
+
+def prepare_day16(mod):
+    mod.packet_versions.clear()
+    packet = mod.Packet()
+    packet.post_init_and_handle_subpackets(mod.prepare_input())
+    return packet
+
+
+def prepare_day19(mod):
+    mod.translations.clear()
+    return mod.prepare_input()
+
+
+def prepare_day21(mod):
+    mod.ways_to_reach.cache_clear()
+    return mod.prepare_input()
+
+
+SPECS = {
+    4: DaySpec(part1=star("part1"), part2=star("part2")),
+    9: DaySpec(prepare=lambda mod: mod.Caves(mod.prepare_input())),
+    11: DaySpec(prepare=lambda mod: mod.Octopi(mod.prepare_input())),
+    12: DaySpec(prepare=lambda mod: mod.Graph.from_edges(mod.prepare_input())),
+    13: DaySpec(part1=star("part1"), part2=star("part2")),
+    14: DaySpec(part1=star("part1"), part2=star("part2")),
+    16: DaySpec(prepare=prepare_day16, part1=lambda mod, packet: mod.part1()),
+    19: DaySpec(prepare=prepare_day19, part1=lambda mod, data: len(mod.part1(data))),
+    20: DaySpec(
+        part1=lambda mod, data: mod.part1(data[1], data[0]),
+        part2=lambda mod, data: mod.part2(data[1], data[0]),
+    ),
+    21: DaySpec(
+        prepare=prepare_day21,
+        part1=star("part1"),
+        part2=lambda mod, data: mod.part2(mod.State((0, 0), (2, 8), 0)),
+    ),
+    22: DaySpec(
+        part1=lambda mod, data: mod.part1(data[:20]),
+        part2=lambda mod, data: mod.part1(data),
+    ),
+    25: DaySpec(part2=None),
+}
+
+
+def module_name(day: int) -> str:
+    return f"day{day:02d}"
+
+
+def percentile(times: list[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    ranked = sorted(times)
+    return ranked[max(0, math.ceil(pct / 100 * len(ranked)) - 1)]
+
+
+def summarize_answer(answer) -> str:
+    """Short, stable form of an answer, so that runs can be diffed."""
+    out = repr(answer)
+    if len(out) > 80:
+        return "sha1:" + hashlib.sha1(out.encode()).hexdigest()[:12]
+    return out
+
+
+def parts_of(day: int) -> list[str]:
+    spec = SPECS.get(day, DaySpec())
+    return ["part1", "part2"] if spec.part2 is not None else ["part1"]
+
+
+def profile_stage(mod: ModuleType, stage: str):
+    """Profile a stage into its own report when --profile is given. The report is
+    named after the stage run, not the function it calls: day 22's part2 calls
+    part1, whose own profiled decorator is then nested and does nothing.
+    """
+    report_dir = os.environ.get("AOC_PROFILE")
+    if not report_dir:
+        return contextlib.nullcontext()
+    return utils.profiling(f"{mod.__name__}.{stage}", report_dir)
+
+
+def run_part(mod: ModuleType, spec: DaySpec, part: str) -> dict[str, tuple]:
+    """One run of prepare_input followed by one part: (seconds, result) per stage.
+    The solutions' own printing is swallowed.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        data = spec.prepare(mod)
+        prepared = time.perf_counter()
+        with profile_stage(mod, part):
+            answer = getattr(spec, part)(mod, data)
+        done = time.perf_counter()
+    return {"prepare": (prepared - start, None), part: (done - prepared, answer)}
+
+
+def peak_memory(mod: ModuleType, spec: DaySpec, part: str) -> dict[str, int]:
+    """Peak traced memory in bytes of prepare_input and one part, from one run."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        tracemalloc.start()
+        data = spec.prepare(mod)
+        prepare_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.reset_peak()
+        getattr(spec, part)(mod, data)
+        part_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return {"prepare": prepare_peak, part: part_peak}
+
+
+def bench_part(
+    day: int, part: str, repeats: int, memory: bool, preload: bool = True
+) -> dict:
+    """Statistics of prepare_input and one part of a day.
+    Parts are independent units of work: each one prepares its own input, and
+    the days that keep module state (16, 19, 21, 23) reset it when preparing.
+    With preload, the lazily imported modules are loaded before any measurement.
+    """
+    mod = importlib.import_module(module_name(day))
+    if preload:
+        utils.load_lazy_modules()
+    spec = SPECS.get(day, DaySpec())
+    peaks = peak_memory(mod, spec, part) if memory else {}
+    runs = [run_part(mod, spec, part) for _ in range(repeats)]
+
+    out = {}
+    for stage in ("prepare", part):
+        times = [run[stage][0] for run in runs]
+        out[stage] = {
+            "median": statistics.median(times),
+            "p95": percentile(times, 95),
+            "peak_bytes": peaks.get(stage),
+        }
+    out[part]["answer"] = summarize_answer(runs[-1][part][1])
+    return out
+
+
+def merge_parts(part_results: list[dict]) -> dict:
+    """Combine the results of the parts of one day, in stage order.
+    prepare_input is reported from the first part's runs.
+    """
+    merged = {}
+    for results in part_results:
+        for stage, stats in results.items():
+            merged.setdefault(stage, stats)
+    return {stage: merged[stage] for stage in STAGES if stage in merged}
+
+
+def bench_day(
+    day: int, repeats: int = REPEATS, memory: bool = True, preload: bool = True
+) -> dict:
+    return merge_parts(
+        [bench_part(day, part, repeats, memory, preload) for part in parts_of(day)]
+    )
+
+
+def import_time(day: int) -> dict:
+    """Time to import a day in a fresh interpreter, from python -X importtime,
+    along with the modules it imports directly that took longest.
+    Modules from utils.lazy_import are loaded after the import and timed apart,
+    since -X importtime does not see them; their times are included.
+    """
+    import subprocess
+
+    name = module_name(day)
+    script = f"import {name}, json, utils; print(json.dumps(utils.load_lazy_modules()))"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        capture_output=True,
+        text=True,
+        cwd=HERE,
+    )
+    # Modules are listed after the modules they import, nested by indentation:
+    # the day's direct imports are the level-1 lines just before its own line.
+    total, direct, pending = 0, [], []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, module = line.removeprefix("import time:").split("|")
+        seconds = int(cumulative_us) / 1e6
+        level = (len(module) - len(module.lstrip()) - 1) // 2
+        if level == 1:
+            pending.append((module.strip(), seconds))
+        elif level == 0:
+            if module.strip() == name:
+                total, direct = seconds, pending
+            pending = []
+    lazy = json.loads(proc.stdout.splitlines()[-1]) if proc.returncode == 0 else {}
+    total += sum(lazy.values())
+    direct += [(f"{module} (lazy)", seconds) for module, seconds in lazy.items()]
+    direct.sort(key=lambda item: item[1], reverse=True)
+    return {
+        "median": total,
+        "p95": total,
+        "peak_bytes": None,
+        "heaviest": dict(direct[:3]),
+    }
+
+
+def bench_days(
+    days: list[int],
+    repeats: int,
+    memory: bool,
+    jobs: int,
+    previous: dict,
+    imports: bool = True,
+    preload: bool = True,
+) -> Iterator[tuple[int, dict]]:
+    """Yield (day, results) in the order of days.
+    With jobs > 1 every part of every day is sent to a process pool. The parts
+    expected to be slowest, going by the previous run, are submitted first.
+    """
+    if jobs == 1:
+        for day in days:
+            results = {"import": import_time(day)} if imports else {}
+            yield day, {**results, **bench_day(day, repeats, memory, preload)}
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    tasks = [(day, part) for day in days for part in parts_of(day)]
+
+    def expected_time(task):
+        day, part = task
+        return previous.get(module_name(day), {}).get(part, {}).get("median", 0)
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {
+            task: pool.submit(bench_part, *task, repeats, memory, preload)
+            for task in sorted(tasks, key=expected_time, reverse=True)
+        }
+        if imports:
+            futures.update(
+                {(day, "import"): pool.submit(import_time, day) for day in days}
+            )
+        for day in days:
+            results = {"import": futures[(day, "import")].result()} if imports else {}
+            yield day, {
+                **results,
+                **merge_parts(
+                    [futures[(day, part)].result() for part in parts_of(day)]
+                ),
+            }
+
+
+def bench_generated(day: int, size: int, repeats: int, memory: bool) -> dict:
+    """bench_day on a generated input of the given size."""
+    import tempfile
+
+    import generators
+
+    with tempfile.TemporaryDirectory() as tmp:
+        generators.write_input(day, size, tmp)
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            return bench_day(day, repeats, memory)
+        finally:
+            os.chdir(cwd)
+
+
+def growth_exponent(sizes: list[int], times: list[float]) -> Optional[float]:
+    """Least-squares slope of log(time) against log(size): about k for O(n^k)."""
+    points = [(math.log(n), math.log(t)) for n, t in zip(sizes, times) if t > 0]
+    if len(points) < 2:
+        return None
+    x_mean = statistics.mean(x for x, _ in points)
+    y_mean = statistics.mean(y for _, y in points)
+    return sum((x - x_mean) * (y - y_mean) for x, y in points) / sum(
+        (x - x_mean) ** 2 for x, _ in points
+    )
+
+
+def sweep_day(
+    day: int, sizes: list[int], repeats: int, memory: bool, jobs: int
+) -> dict:
+    """Time a day over generated inputs of increasing size."""
+    tasks = [(day, size, repeats, memory) for size in sizes]
+    if jobs == 1:
+        runs = [bench_generated(*task) for task in tasks]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            runs = list(pool.map(bench_generated, *zip(*tasks)))
+
+    out = {"sizes": sizes}
+    for stage in runs[0]:
+        medians = [run[stage]["median"] for run in runs]
+        out[stage] = {
+            "median": medians,
+            "peak_bytes": [run[stage]["peak_bytes"] for run in runs],
+            "exponent": growth_exponent(sizes, medians),
+        }
+    return out
+
+
+def print_sweep(day: int, results: dict):
+    for stage in STAGES:
+        if stage not in results:
+            continue
+        stats = results[stage]
+        timings = "  ".join(
+            f"n={size}: {format_seconds(t)}"
+            for size, t in zip(results["sizes"], stats["median"])
+        )
+        exponent = stats["exponent"]
+        curve = f"~n^{exponent:.2f}" if exponent is not None else "-"
+        print(f"{module_name(day):<6} {stage:<8} {curve:>8}  {timings}", flush=True)
+
+
+def git_commit() -> Optional[str]:
+    import subprocess
+
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def format_seconds(seconds: float) -> str:
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.0f}us"
+    if seconds < 1:
+        return f"{seconds * 1e3:.1f}ms"
+    return f"{seconds:.2f}s"
+
+
+def format_bytes(num_bytes: Optional[int]) -> str:
+    if num_bytes is None:
+        return "-"
+    for unit in ("B", "KiB", "MiB"):
+        if num_bytes < 1024:
+            return f"{num_bytes:.0f}{unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:.1f}GiB"
+
+
+def print_day(day: int, results: dict, previous: Optional[dict] = None):
+    for stage, stats in results.items():
+        line = (
+            f"{module_name(day):<6} {stage:<8}"
+            f" {format_seconds(stats['median']):>9} {format_seconds(stats['p95']):>9}"
+            f" {format_bytes(stats['peak_bytes']):>9}"
+        )
+        if previous and (old := previous.get(stage)):
+            line += f" {stats['median'] / old['median']:>6.2f}x"
+        if "answer" in stats:
+            line += f"  {stats['answer']}"
+        if "heaviest" in stats:
+            line += "  " + ", ".join(
+                f"{module} {format_seconds(seconds)}"
+                for module, seconds in stats["heaviest"].items()
+            )
+        print(line, flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("days", nargs="*", type=parse_day, default=discover_days())
+    parser.add_argument("-r", "--repeats", type=int, default=REPEATS)
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="worker processes, 0 for one per CPU (default: run in-process)",
+    )
+    parser.add_argument(
+        "--sweep",
+        action="store_true",
+        help="time generated inputs of increasing size instead of the real ones",
+    )
+    parser.add_argument("--sizes", nargs="+", type=int, help="input sizes for --sweep")
+    parser.add_argument(
+        "--profile",
+        metavar="DIR",
+        help="profile every part into its own report in DIR (one run, no tracemalloc"
+        " pass; timings include the profiling overhead)",
+    )
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--compare", help="JSON results of an earlier run")
+    parser.add_argument(
+        "--no-memory", action="store_true", help="skip the tracemalloc run"
+    )
+    parser.add_argument(
+        "--no-import-time",
+        action="store_true",
+        help="skip timing the imports of each day in a fresh interpreter",
+    )
+    parser.add_argument(
+        "--run",
+        action="store_true",
+        help="just run each day once: no warm-up, memory or import-time passes",
+    )
+    args = parser.parse_args()
+    if args.run:
+        args.repeats = 1
+        args.no_memory = True
+        args.no_import_time = True
+    if args.profile:
+        os.environ["AOC_PROFILE"] = args.profile  # read by profile_stage and the days
+        args.repeats = 1
+        args.no_memory = True
+
+    previous = {}
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)["days"]
+
+    jobs = args.jobs or os.cpu_count()
+    report = {
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "repeats": args.repeats,
+        "jobs": jobs,
+        "days": {},
+    }
+    start = time.perf_counter()
+    if args.sweep:
+        import generators
+
+        report["sweep"] = report.pop("days")
+        print(f"{'day':<6} {'stage':<8} {'growth':>8}  median per size")
+        for day in args.days:
+            if day not in generators.GENERATORS:
+                print(f"{module_name(day):<6} no generator, skipped")
+                continue
+            sizes = args.sizes or list(generators.SWEEP_SIZES[day])
+            results = sweep_day(day, sizes, args.repeats, not args.no_memory, jobs)
+            report["sweep"][module_name(day)] = results
+            print_sweep(day, results)
+    else:
+        print(f"{'day':<6} {'stage':<8} {'median':>9} {'p95':>9} {'peak':>9}")
+        for day, results in bench_days(
+            args.days,
+            args.repeats,
+            not args.no_memory,
+            jobs,
+            previous,
+            imports=not args.no_import_time,
+            preload=not args.run,
+        ):
+            report["days"][module_name(day)] = results
+            print_day(day, results, previous.get(module_name(day)))
+    report["wall_time"] = time.perf_counter() - start
+    print(f"total wall time {format_seconds(report['wall_time'])} ({jobs} jobs)")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,277 @@
-from dataclasses import dataclass, field
-import heapq
-from typing import Any
+import contextlib
+import functools
+import importlib.util
+import mmap
+import os
+import sys
+from typing import Iterator
+
+# Modules only needed for caching and profiling are imported where they are used,
+# to keep the startup of a single day short.
+
+CHUNK_SIZE = 1 << 20
+PARSE_CACHE_DIR = os.environ.get("AOC_PARSE_CACHE", ".parse_cache")
+
+_lazy_modules: list[str] = []
 
 
 def get_name():
     return globals()["__file__"].split("\\")[-1].split(".")[0]
 
 
+def lazy_import(name: str):
+    """Module that is only really imported on first attribute access, for heavy
+    dependencies like numpy. Raises ModuleNotFoundError right away if the module
+    is not installed.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    _lazy_modules.append(name)
+    return module
+
+
+def optional_import(name: str):
+    """lazy_import for optional dependencies: None if the module is not installed,
+    so that callers can fall back to a pure Python path.
+    """
+    try:
+        return lazy_import(name)
+    except ModuleNotFoundError:
+        return None
+
+
+def load_lazy_modules() -> dict[str, float]:
+    """Finish importing every module from lazy_import, so that the imports do not
+    land inside a time or memory measurement. Returns the seconds each load took.
+    """
+    import time
+
+    out = {}
+    for name in _lazy_modules:
+        start = time.perf_counter()
+        getattr(sys.modules[name], "__name__")
+        out[name] = time.perf_counter() - start
+    return out
+
+
+def input_path(num_day):
+    return f"day{num_day}_input.txt"
+
+
 def read_input(num_day):
-    fname = f"day{num_day}_input.txt"
+    fname = input_path(num_day)
     with open(fname) as f:
         out = f.read()
     return out
+
+
+def read_chunks(fname, chunk_size=CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield the raw bytes of a file in chunks.
+    The file is memory-mapped when possible, otherwise read piece by piece.
+    """
+    with open(fname, "rb") as f:
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):  # empty file, pipe, ...
+            while chunk := f.read(chunk_size):
+                yield chunk
+            return
+        with buf:
+            for start in range(0, len(buf), chunk_size):
+                yield buf[start : start + chunk_size]
+
+
+def _strip_cr(line: bytes) -> bytes:
+    return line[:-1] if line.endswith(b"\r") else line
+
+
+def raw_lines(fname, chunk_size=CHUNK_SIZE) -> Iterator[bytes]:
+    """Split the chunks of a file into lines, without the newlines.
+    Lines longer than a chunk are stitched back together. Windows line endings
+    are handled like in text mode: the \\r before a \\n is dropped too.
+    """
+    pieces = []
+    for chunk in read_chunks(fname, chunk_size):
+        *lines, last = chunk.split(b"\n")
+        if lines:
+            pieces.append(lines[0])
+            lines[0] = b"".join(pieces)
+            pieces = []
+            yield from map(_strip_cr, lines)
+        pieces.append(last)
+    yield _strip_cr(b"".join(pieces))
+
+
+def iter_lines(num_day, chunk_size=CHUNK_SIZE) -> Iterator[str]:
+    """Lazy version of read_input(num_day).strip().split("\\n").
+    Blank lines at either end are dropped, blank lines in between are kept.
+    """
+    started = False
+    blanks = []
+    for raw in raw_lines(input_path(num_day), chunk_size):
+        line = raw.decode()
+        if not line.strip():
+            blanks.append(line)
+            continue
+        if started:
+            yield from blanks
+        started = True
+        blanks = []
+        yield line
+
+
+def iter_blocks(num_day, chunk_size=CHUNK_SIZE) -> Iterator[str]:
+    """Lazy version of read_input(num_day).strip().split("\\n\\n").
+    Any run of blank lines separates two blocks.
+    """
+    block = []
+    for line in iter_lines(num_day, chunk_size):
+        if line.strip():
+            block.append(line)
+        elif block:
+            yield "\n".join(block)
+            block = []
+    if block:
+        yield "\n".join(block)
+
+
+def file_digest(fname) -> str:
+    import hashlib
+
+    h = hashlib.blake2b(digest_size=16)
+    for chunk in read_chunks(fname):
+        h.update(chunk)
+    return h.hexdigest()
+
+
+def cached_parse(num_day, version=1):
+    """Decorator caching what a parser of day num_day's input returns.
+    Entries are pickles keyed by the day, the parser's name, its version and the
+    hash of the input file, so editing the input invalidates them. The key does not
+    use the module name, so a day run as a script shares the runner's entries.
+    Bump version when the parser changes. Setting AOC_PARSE_CACHE to an empty
+    string turns the cache off.
+    """
+
+    def decorator(parser):
+        @functools.wraps(parser)
+        def wrapper():
+            if not PARSE_CACHE_DIR:
+                return parser()
+            import pickle
+
+            key = "-".join(
+                [
+                    f"day{num_day}.{parser.__qualname__}",
+                    f"v{version}",
+                    file_digest(input_path(num_day)),
+                ]
+            )
+            path = os.path.join(PARSE_CACHE_DIR, key + ".pickle")
+            try:
+                with open(path, "rb") as f:
+                    return pickle.load(f)
+            except FileNotFoundError:
+                pass
+            except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+                pass  # stale or truncated entry; parse again and overwrite it
+
+            out = parser()
+            os.makedirs(PARSE_CACHE_DIR, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(out, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+            return out
+
+        return wrapper
+
+    return decorator
+
+
+_profiling_active = False
+
+
+@contextlib.contextmanager
+def profiling(name: str, report_dir: str = "profiles"):
+    """Profile the body of the with statement and write a report to
+    report_dir/<name>.txt. Every name gets its own file, so that worker processes
+    profiling different parts never write to the same one.
+    The report holds the wall time, the tracemalloc peak, the top allocation
+    sites and the cProfile stats, which include the call count of every function.
+    The raw stats are also dumped to report_dir/<name>.prof.
+    Nested uses only profile the outermost block.
+    """
+    import cProfile
+    import io
+    import pstats
+    import time
+    import tracemalloc
+
+    global _profiling_active
+    if _profiling_active:
+        yield
+        return
+
+    _profiling_active = True
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        wall_time = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        top_sites = tracemalloc.take_snapshot().statistics("lineno")[:10]
+        if started_tracing:
+            tracemalloc.stop()
+        _profiling_active = False
+
+        os.makedirs(report_dir, exist_ok=True)
+        profiler.dump_stats(os.path.join(report_dir, f"{name}.prof"))
+        out = io.StringIO()
+        out.write(f"=== {name} ===\n")
+        out.write(f"wall time: {wall_time:.3f}s (profiled)\n")
+        out.write(f"tracemalloc peak: {peak / 2 ** 20:.2f} MiB\n")
+        out.write("top allocation sites still alive at the end:\n")
+        for stat in top_sites:
+            out.write(f"  {stat}\n")
+        stats = pstats.Stats(profiler, stream=out)
+        stats.sort_stats("cumulative").print_stats(25)
+        stats.sort_stats("ncalls").print_stats(10)
+
+        with open(os.path.join(report_dir, f"{name}.txt"), "w") as f:
+            f.write(out.getvalue())
+
+
+def profiled(fn):
+    """Decorator for part1/part2: profile every call when the AOC_PROFILE
+    environment variable names a report directory, see profiling.
+    Otherwise fn is returned untouched, so the decorator costs nothing.
+    """
+    report_dir = os.environ.get("AOC_PROFILE")
+    if not report_dir:
+        return fn
+
+    import inspect
+
+    day = os.path.splitext(os.path.basename(inspect.getfile(fn)))[0]
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with profiling(f"{day}.{fn.__name__}", report_dir):
+            return fn(*args, **kwargs)
+
+    return wrapper